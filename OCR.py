@@ -1,25 +1,615 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
+import numpy as np
 import pytesseract
 import os
+import sys
+import json
+import time
+import shlex
+import sqlite3
+import queue
+import hashlib
+import argparse
+import threading
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
+from batch_io import iter_input_files, make_row_writer
+
+try:
+    import tesserocr  # opsional: Tesseract C-API, model dimuat sekali per worker
+except ImportError:
+    tesserocr = None
+
+try:
+    import fitz  # opsional: PyMuPDF untuk input PDF
+except ImportError:
+    fitz = None
 
 # Path Tesseract Configuration
 # ex: r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Language en/id
+OCR_LANG = 'ind+eng'
+IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.bmp')
+DOCUMENT_EXTS = ('.tif', '.tiff', '.pdf')  # multi-page
+INPUT_EXTS = IMAGE_EXTS + DOCUMENT_EXTS
+PDF_DPI = 300
+
+# 'auto' = tesserocr kalau terpasang, fallback ke pytesseract
+OCR_ENGINE = 'auto'
+
+# ===================== OCR ENGINES =====================
+def make_word(text, left, top, width, height, conf, line=None):
+    return {'text': text, 'left': int(left), 'top': int(top), 'width': int(width),
+            'height': int(height), 'conf': float(conf), 'line': line}
+
+def parse_tesseract_config(config):
+    # '--psm 6 --oem 1 -c key=value' -> (psm, oem, [(key, value)])
+    psm = oem = None
+    variables = []
+    args = shlex.split(config or '')
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('--psm', '--oem', '-c') and i + 1 < len(args):
+            value = args[i + 1]
+            if arg == '--psm':
+                psm = int(value)
+            elif arg == '--oem':
+                oem = int(value)
+            elif '=' in value:
+                variables.append(tuple(value.split('=', 1)))
+            i += 2
+        else:
+            i += 1
+    return psm, oem, variables
+
+def tessdata_dir():
+    # tessdata di samping tesseract.exe (instalasi Windows), selain itu default tesserocr
+    path = os.environ.get('TESSDATA_PREFIX')
+    if not path:
+        path = os.path.join(os.path.dirname(pytesseract.pytesseract.tesseract_cmd), 'tessdata')
+    return path if os.path.isdir(path) else None
+
+class PytesseractEngine:
+    # Fallback: temp file + proses tesseract baru + load traineddata untuk setiap gambar
+    name = 'pytesseract'
+
+    def __init__(self, lang=OCR_LANG, config=''):
+        self.lang = lang
+        self.config = config
+
+    def image_to_string(self, img):
+        return pytesseract.image_to_string(img, lang=self.lang, config=self.config)
+
+    def image_to_data(self, img):
+        data = pytesseract.image_to_data(img, lang=self.lang, config=self.config,
+                                         output_type=pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data['text']):
+            if int(data['level'][i]) != 5 or not str(text).strip():
+                continue
+            words.append(make_word(str(text), data['left'][i], data['top'][i], data['width'][i],
+                                   data['height'][i], data['conf'][i],
+                                   (data['block_num'][i], data['par_num'][i], data['line_num'][i])))
+        return words
+
+class TesserocrEngine:
+    # Satu TessBaseAPI yang hidup terus: bahasa dimuat sekali, tanpa subprocess per gambar
+    name = 'tesserocr'
+
+    def __init__(self, lang=OCR_LANG, config=''):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        psm, oem, variables = parse_tesseract_config(config)
+        kwargs = {'lang': lang}
+        if tessdata_dir():
+            kwargs['path'] = tessdata_dir()
+        if psm is not None:
+            kwargs['psm'] = psm
+        if oem is not None:
+            kwargs['oem'] = oem
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+        for key, value in variables:
+            self.api.SetVariable(key, value)
+
+    def image_to_string(self, img):
+        self.api.SetImage(img)
+        return self.api.GetUTF8Text()
+
+    def image_to_data(self, img):
+        RIL = tesserocr.RIL
+        self.api.SetImage(img)
+        self.api.Recognize()
+        words = []
+        block = line = 0
+        for it in tesserocr.iterate_level(self.api.GetIterator(), RIL.WORD):
+            if it.IsAtBeginningOf(RIL.BLOCK):
+                block += 1
+            if it.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+            text = it.GetUTF8Text(RIL.WORD)
+            box = it.BoundingBox(RIL.WORD)
+            if not text or not text.strip() or box is None:
+                continue
+            x0, y0, x1, y1 = box
+            words.append(make_word(text, x0, y0, x1 - x0, y1 - y0, it.Confidence(RIL.WORD), (block, line)))
+        return words
+
+ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEngine.name: TesserocrEngine,
+}
+
+# TessBaseAPI tidak thread-safe -> satu engine per thread (dan per proses worker)
+_engines = threading.local()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def shared_pool(kind, workers):
+    # Thread pool yang hidup sepanjang proses: engine per thread (di atas) tidak dibangun
+    # ulang untuk setiap dokumen/gambar. 'pages' dan 'tiles' terpisah karena thread halaman
+    # menunggu hasil tile -> satu pool bersama bisa deadlock.
+    with _pools_lock:
+        pool = _pools.get((kind, workers))
+        if pool is None:
+            pool = _pools[(kind, workers)] = ThreadPoolExecutor(workers, thread_name_prefix=f'ocr-{kind}')
+        return pool
+
+def get_engine(name=None, lang=OCR_LANG, config=''):
+    name = name or OCR_ENGINE
+    cache = getattr(_engines, 'cache', None)
+    if cache is None:
+        cache = _engines.cache = {}
+    key = (name, lang, config)
+    engine = cache.get(key)
+    if engine is None:
+        if name == 'auto':
+            try:
+                engine = TesserocrEngine(lang, config)
+            except Exception:
+                engine = PytesseractEngine(lang, config)
+        else:
+            engine = ENGINES[name](lang, config)
+        cache[key] = engine
+    return engine
+
+# ===================== RESULT CACHE =====================
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.ocr_cache.sqlite3')
+DEFAULT_CACHE_MB = 256
+
+CACHE_SCHEMA = '''
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS ocr_cache (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ocr_cache_lru ON ocr_cache(last_used);
+CREATE TABLE IF NOT EXISTS ocr_cache_size (total INTEGER NOT NULL);
+INSERT INTO ocr_cache_size SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM ocr_cache_size);
+CREATE TRIGGER IF NOT EXISTS ocr_cache_ins AFTER INSERT ON ocr_cache
+BEGIN UPDATE ocr_cache_size SET total = total + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS ocr_cache_upd AFTER UPDATE OF size ON ocr_cache
+BEGIN UPDATE ocr_cache_size SET total = total - OLD.size + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS ocr_cache_del AFTER DELETE ON ocr_cache
+BEGIN UPDATE ocr_cache_size SET total = total - OLD.size; END;
+'''
+
+def image_cache_key(img, *params):
+    # Hash dari piksel hasil decode (bukan file), jadi re-upload/re-encode yang sama tetap hit
+    h = hashlib.sha256(f"{img.mode}|{img.size[0]}x{img.size[1]}".encode())
+    h.update(img.tobytes())
+    for param in params:
+        h.update(b'\0' + str(param).encode())
+    return h.hexdigest()
+
+class OCRCache:
+    # Cache teks OCR di SQLite, LRU dibatasi total ukuran teks (byte)
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.executescript(CACHE_SCHEMA)
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute('SELECT text FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self.db:
+                self.db.execute('UPDATE ocr_cache SET last_used = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+
+    def put(self, key, text):
+        size = len(text.encode('utf-8'))
+        with self.lock, self.db:
+            self.db.execute(
+                'INSERT INTO ocr_cache (key, text, size, last_used) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET text = excluded.text, size = excluded.size, '
+                'last_used = excluded.last_used',
+                (key, text, size, time.time()))
+            # Buang entri yang paling lama tidak dipakai sampai di bawah limit
+            while self._total_bytes() > self.max_bytes:
+                deleted = self.db.execute(
+                    'DELETE FROM ocr_cache WHERE key IN (SELECT key FROM ocr_cache '
+                    'WHERE key != ? ORDER BY last_used LIMIT 1)', (key,)).rowcount
+                if not deleted:
+                    break
+
+    def _total_bytes(self):
+        return self.db.execute('SELECT total FROM ocr_cache_size').fetchone()[0]
+
+    def stats(self):
+        with self.lock:
+            entries = self.db.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': entries, 'bytes': self._total_bytes()}
+
+    def close(self):
+        self.db.close()
+
+# ===================== PREPROCESSING =====================
+PREPROCESS_STAGES = ('gray', 'downscale', 'deskew', 'binarize')
+A4_LONG_EDGE_INCH = 11.69
+
+@dataclass(frozen=True)
+class Preprocess:
+    # Stage dijalankan dengan urutan PREPROCESS_STAGES, apa pun urutan yang diberikan
+    stages: tuple = ()
+    target_dpi: int = 300
+    source_dpi: int = None  # None -> dari metadata gambar, atau estimasi ukuran A4
+    block: int = 31         # ukuran window binarisasi (px, ganjil)
+    k: float = 0.2          # parameter Sauvola
+    max_skew: float = 5.0   # derajat
+
+    @classmethod
+    def parse(cls, spec, **params):
+        # 'gray,deskew' / 'all' / '' -> Preprocess
+        names = PREPROCESS_STAGES if spec == 'all' else [n.strip() for n in (spec or '').split(',') if n.strip()]
+        unknown = set(names) - set(PREPROCESS_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown preprocessing stage: {', '.join(sorted(unknown))}")
+        return cls(tuple(n for n in PREPROCESS_STAGES if n in names), **params)
+
+    def key(self):
+        return repr(self) if self.stages else ''
+
+def to_gray(arr):
+    if arr.ndim == 2:
+        return arr
+    # Luma ITU-R 601 dengan aritmetika integer (lebih cepat dari float untuk uint8)
+    rgb = arr[..., :3].astype(np.uint32)
+    gray = (rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114 + 500) // 1000
+    return gray.astype(np.uint8)
+
+def source_dpi(img, arr, default=None):
+    if default:
+        return default
+    dpi = img.info.get('dpi', (0, 0))[0]
+    # Foto HP sering menulis 72 dpi yang tidak bermakna -> anggap halaman A4
+    if dpi and dpi >= 100:
+        return float(dpi)
+    return max(arr.shape[:2]) / A4_LONG_EDGE_INCH
+
+def downscale(arr, scale):
+    if scale >= 1:
+        return arr
+    h, w = arr.shape[:2]
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    # Resampling di C (PIL), reducing_gap = box-filter dulu lalu bilinear
+    return np.asarray(Image.fromarray(arr).resize(size, Image.BILINEAR, reducing_gap=2.0))
+
+def adaptive_binarize(gray, block=31, k=0.2):
+    # Sauvola threshold per piksel dari integral image (tanpa loop Python)
+    pad = block // 2
+    g = np.pad(gray, pad, mode='edge').astype(np.float64)
+    s1 = np.zeros((g.shape[0] + 1, g.shape[1] + 1))
+    s2 = np.zeros_like(s1)
+    np.cumsum(np.cumsum(g, axis=0), axis=1, out=s1[1:, 1:])
+    np.cumsum(np.cumsum(g * g, axis=0), axis=1, out=s2[1:, 1:])
+    h, w = gray.shape
+    n = block * block
+
+    def window_sum(s):
+        return s[block:block + h, block:block + w] - s[:h, block:block + w] - s[block:block + h, :w] + s[:h, :w]
+
+    mean = window_sum(s1) / n
+    std = np.sqrt(np.maximum(window_sum(s2) / n - mean * mean, 0))
+    threshold = mean * (1 + k * (std / 128 - 1))
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
+
+def estimate_skew(gray, max_angle=5.0, step=0.25, max_points=50000):
+    # Projection profile: sudut dengan histogram baris paling "tajam" = sudut baris teks
+    stride = max(1, max(gray.shape) // 1000)
+    small = gray[::stride, ::stride]
+    ys, xs = np.nonzero(small < min(128, small.mean() * 0.75))
+    if len(ys) < 50:
+        return 0.0
+    if len(ys) > max_points:
+        pick = np.random.default_rng(0).choice(len(ys), max_points, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    rad = np.deg2rad(angles)
+    rows = np.rint(ys[None, :] * np.cos(rad)[:, None] + xs[None, :] * np.sin(rad)[:, None]).astype(np.int64)
+    rows -= rows.min()
+    span = int(rows.max()) + 1
+    rows += np.arange(len(angles))[:, None] * span
+    hist = np.bincount(rows.ravel(), minlength=len(angles) * span).reshape(len(angles), span)
+    score = (hist.astype(np.float64) ** 2).sum(axis=1)
+    return float(angles[np.argmax(score)])
+
+def deskew(gray, max_angle=5.0):
+    angle = estimate_skew(gray, max_angle)
+    if abs(angle) < 0.1:
+        return gray
+    rotated = Image.fromarray(gray).rotate(-angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+    return np.asarray(rotated)
+
+def preprocess_image(img, options):
+    if not options or not options.stages:
+        return img
+    if img.mode not in ('L', 'RGB', 'RGBA'):
+        img = img.convert('RGB')
+    arr = np.asarray(img)
+    stages = options.stages
+    if 'gray' in stages or 'deskew' in stages or 'binarize' in stages:
+        arr = to_gray(arr)
+    if 'downscale' in stages:
+        arr = downscale(arr, options.target_dpi / source_dpi(img, arr, options.source_dpi))
+    if 'deskew' in stages:
+        arr = deskew(arr, options.max_skew)
+    if 'binarize' in stages:
+        arr = adaptive_binarize(arr, options.block, options.k)
+    return Image.fromarray(arr)
+
+# ===================== TILED OCR =====================
+TILE_SIZE = 2000
+TILE_OVERLAP = 200  # harus lebih lebar dari kata terpanjang
+
+def tile_boxes(width, height, tile=TILE_SIZE, overlap=TILE_OVERLAP):
+    step = max(tile - overlap, 1)
+
+    def starts(length):
+        pos = list(range(0, max(length - tile, 0) + 1, step))
+        if pos[-1] + tile < length:
+            pos.append(length - tile)
+        return pos
+
+    return [(x, y, min(x + tile, width), min(y + tile, height))
+            for y in starts(height) for x in starts(width)]
+
+def _overlap_ratio(a, b):
+    # Luas irisan dibagi luas box yang lebih kecil
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return w * h / max(smaller, 1)
+
+def merge_words(words, threshold=0.5, cell=128):
+    # Kata dobel di area overlap: simpan yang utuh (tidak terpotong tepi tile) lalu conf tertinggi
+    kept = []
+    grid = {}
+    for word in sorted(words, key=lambda w: (w.get('clipped', False), -w['conf'])):
+        box = (word['left'], word['top'], word['left'] + word['width'], word['top'] + word['height'])
+        cells = [(cx, cy) for cx in range(box[0] // cell, box[2] // cell + 1)
+                 for cy in range(box[1] // cell, box[3] // cell + 1)]
+        if any(_overlap_ratio(box, other) > threshold for c in cells for other in grid.get(c, ())):
+            continue
+        kept.append(word)
+        for c in cells:
+            grid.setdefault(c, []).append(box)
+    return kept
+
+def group_lines(words):
+    # Kata diurutkan dari tengah vertikal; masuk baris yang sama kalau tengahnya di dalam tinggi baris
+    lines = []
+    top = bottom = None
+    for word in sorted(words, key=lambda w: w['top'] + w['height'] / 2):
+        center = word['top'] + word['height'] / 2
+        if lines and top <= center <= bottom:
+            lines[-1].append(word)
+            top = min(top, word['top'])
+            bottom = max(bottom, word['top'] + word['height'])
+        else:
+            lines.append([word])
+            top, bottom = word['top'], word['top'] + word['height']
+    return [sorted(line, key=lambda w: w['left']) for line in lines]
+
+def words_to_text(words):
+    return '\n'.join(' '.join(w['text'] for w in line) for line in group_lines(words))
+
+def _mean_conf(words):
+    # conf -1 = bukan hasil pengenalan (Tesseract), tidak dihitung
+    confs = [w['conf'] for w in words if w['conf'] >= 0]
+    return round(sum(confs) / len(confs), 1) if confs else 0.0
+
+def page_data(words, size):
+    # Output terstruktur yang ringkas: kata = [text, left, top, width, height, conf]
+    if words and all(w['line'] is not None for w in words):
+        by_line = {}
+        for word in words:
+            by_line.setdefault(word['line'], []).append(word)
+        lines = list(by_line.values())
+    else:
+        lines = group_lines(words)
+    line_rows = [{
+        'text': ' '.join(w['text'] for w in line),
+        'box': [min(w['left'] for w in line), min(w['top'] for w in line),
+                max(w['left'] + w['width'] for w in line), max(w['top'] + w['height'] for w in line)],
+        'conf': _mean_conf(line),
+    } for line in lines]
+    return {
+        'width': size[0],
+        'height': size[1],
+        'mean_conf': _mean_conf(words),
+        'text': '\n'.join(line['text'] for line in line_rows),
+        'lines': line_rows,
+        'words': [[w['text'], w['left'], w['top'], w['width'], w['height'], round(w['conf'], 1)]
+                  for w in words],
+    }
+
+def ocr_tiled_words(img, tile=TILE_SIZE, overlap=TILE_OVERLAP, workers=None,
+                    engine=None, lang=OCR_LANG, config=''):
+    width, height = img.size
+    margin = 2
+
+    def run(box):
+        words = get_engine(engine, lang, config).image_to_data(img.crop(box))
+        x0, y0, x1, y1 = box
+        for word in words:
+            # Menyentuh tepi dalam tile -> kemungkinan terpotong, tile tetangga melihatnya utuh
+            word['clipped'] = ((x0 > 0 and word['left'] <= margin) or
+                               (y0 > 0 and word['top'] <= margin) or
+                               (x1 < width and word['left'] + word['width'] >= x1 - x0 - margin) or
+                               (y1 < height and word['top'] + word['height'] >= y1 - y0 - margin))
+            word['left'] += x0
+            word['top'] += y0
+            word['line'] = None  # id baris per tile tidak berlaku lagi
+        return words
+
+    workers = workers or os.cpu_count() or 1
+    boxes = tile_boxes(width, height, tile, overlap)
+    # Satu worker -> jalan di thread pemanggil, engine thread ini dipakai ulang
+    results = map(run, boxes) if workers == 1 else shared_pool('tiles', workers).map(run, boxes)
+    words = [w for tile_words in results for w in tile_words]
+    merged = merge_words(words)
+    for word in merged:
+        word.pop('clipped', None)
+    return merged
+
+# ===================== OCR CORE =====================
+def _ocr_image(img, lang=OCR_LANG, config='', engine=None, cache=None, preprocess=None,
+               roi=None, tile=None, overlap=TILE_OVERLAP, tile_workers=None, structured=False):
+    # -> (text atau page_data kalau structured, dari cache atau tidak)
+    if roi:
+        # Hanya area (x0, y0, x1, y1) yang di-hash, di-preprocess dan di-OCR
+        img = img.crop(roi)
+    key = None
+    if cache is not None:
+        # Key dari gambar asli + opsi preprocessing, jadi cache hit melewati preprocessing juga
+        key = image_cache_key(img, lang, config, preprocess.key() if preprocess else '',
+                              f"tile={tile},{overlap}" if tile else '', 'data' if structured else '')
+        text = cache.get(key)
+        if text is not None:
+            return (json.loads(text) if structured else text), True
+    ready = preprocess_image(img, preprocess)
+    tiled = tile and max(ready.size) > tile
+    if structured:
+        if tiled:
+            words = ocr_tiled_words(ready, tile, overlap, tile_workers, engine, lang, config)
+        else:
+            words = get_engine(engine, lang, config).image_to_data(ready)
+        result = page_data(words, ready.size)
+    elif tiled:
+        result = words_to_text(ocr_tiled_words(ready, tile, overlap, tile_workers, engine, lang, config))
+    else:
+        result = get_engine(engine, lang, config).image_to_string(ready)
+    if key is not None:
+        cache.put(key, json.dumps(result, ensure_ascii=False, separators=(',', ':')) if structured else result)
+    return result, False
+
+def ocr_image(img, **ocr_opts):
+    return _ocr_image(img, **ocr_opts)[0]
+
+# ===================== MULTI-PAGE (TIFF / PDF) =====================
+def is_document(path):
+    return path.lower().endswith(DOCUMENT_EXTS)
+
+def _require_fitz():
+    if fitz is None:
+        raise RuntimeError("PyMuPDF (fitz) is required for PDF input")
+
+def _pixmap_to_image(pix, dpi):
+    img = Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+    img.info['dpi'] = (dpi, dpi)
+    return img
+
+def count_pages(path):
+    if path.lower().endswith('.pdf'):
+        _require_fitz()
+        with fitz.open(path) as doc:
+            return doc.page_count
+    with Image.open(path) as img:
+        return getattr(img, 'n_frames', 1)
+
+def load_page(path, index=0, dpi=PDF_DPI):
+    if path.lower().endswith('.pdf'):
+        _require_fitz()
+        with fitz.open(path) as doc:
+            return _pixmap_to_image(doc[index].get_pixmap(dpi=dpi), dpi)
+    img = Image.open(path)
+    if index:
+        img.seek(index)
+    img.load()
+    return img
+
+def iter_pages(path, dpi=PDF_DPI):
+    # Lazy: hanya satu halaman yang dirasterisasi/di-decode setiap langkah
+    if path.lower().endswith('.pdf'):
+        _require_fitz()
+        with fitz.open(path) as doc:
+            for index, page in enumerate(doc):
+                yield index, _pixmap_to_image(page.get_pixmap(dpi=dpi), dpi)
+        return
+    with Image.open(path) as img:
+        for index in range(getattr(img, 'n_frames', 1)):
+            img.seek(index)
+            yield index, img.copy()
+
+def map_pages(fn, path, workers=None, in_flight=None, dpi=PDF_DPI):
+    # fn(index, page) dijalankan paralel, hasil keluar sesuai urutan halaman.
+    # Memori dibatasi jumlah halaman in-flight, bukan ukuran dokumen.
+    workers = workers or os.cpu_count() or 1
+    in_flight = max(in_flight or workers * 2, 1)
+    pool = shared_pool('pages', workers)
+    pending = deque()
+    try:
+        for index, page in iter_pages(path, dpi):
+            pending.append(pool.submit(fn, index, page))
+            del page
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Berhenti lebih awal (cancel GUI / error) -> halaman yang belum jalan dibuang
+        for future in pending:
+            future.cancel()
+
+POLL_MS = 50
+
 class OCRApp:
-    def __init__(self, root):
+    def __init__(self, root, preprocess=None):
         self.root = root
+        self.preprocess = preprocess
         self.root.title("OCR with Tesseract")
-        self.root.geometry("600x500")
+        self.root.geometry("600x520")
 
         # UI Elements
         self.label_instruksi = tk.Label(root, text="Browse Image", font=("Arial", 12))
         self.label_instruksi.pack(pady=10)
 
-        self.btn_pilih = tk.Button(root, text="Open Image", command=self.pilih_gambar, bg="#4CAF50", fg="white", padx=10)
-        self.btn_pilih.pack()
+        btn_frame = tk.Frame(root)
+        btn_frame.pack()
+        self.btn_pilih = tk.Button(btn_frame, text="Open Image", command=self.pilih_gambar, bg="#4CAF50", fg="white", padx=10)
+        self.btn_pilih.pack(side="left", padx=5)
+        self.btn_cancel = tk.Button(btn_frame, text="Cancel", command=self.batal, state="disabled")
+        self.btn_cancel.pack(side="left", padx=5)
 
         self.canvas = tk.Label(root) # Preview
         self.canvas.pack(pady=10)
@@ -30,27 +620,127 @@ class OCRApp:
         self.btn_copy = tk.Button(root, text="Copy Text", command=self.salin_teks)
         self.btn_copy.pack()
 
-    def pilih_gambar(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.jpeg *.png *.bmp")])
-        if file_path:
-            # Image Preview (Resize Fit to Display)
-            img = Image.open(file_path)
-            img.thumbnail((200, 200))
-            img_display = ImageTk.PhotoImage(img)
-            self.canvas.config(image=img_display)
-            self.canvas.image = img_display
-
-            # Run OCR
-            self.proses_ocr(file_path)
-
-    def proses_ocr(self, path):
+        self.label_status = tk.Label(root, fg="gray")
+        self.label_status.pack()
+
         try:
-            # Language en/id
-            extracted_text = pytesseract.image_to_string(Image.open(path), lang='ind+eng')
+            self.cache = OCRCache()
+        except sqlite3.Error:
+            self.cache = None
+
+        # OCR jalan di worker thread; hasil dikirim lewat queue dan dibaca di event loop Tk
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.job_counter = 0
+        self.cancelled_upto = 0  # job id <= ini dibatalkan
+        self.pending = 0
+        self.current = None
+        threading.Thread(target=self._worker, daemon=True).start()
+        self.root.after(POLL_MS, self._poll_results)
+
+    def pilih_gambar(self):
+        paths = filedialog.askopenfilenames(filetypes=[
+            ("Image files", "*.jpg *.jpeg *.png *.bmp *.tif *.tiff *.pdf"),
+            ("Multi-page (TIFF/PDF)", "*.tif *.tiff *.pdf")])
+        if not paths:
+            return
+        if not self.pending:
             self.text_result.delete(1.0, tk.END)
-            self.text_result.insert(tk.END, extracted_text)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed: {e}")
+        for path in paths:
+            self.job_counter += 1
+            self.pending += 1
+            self.jobs.put((self.job_counter, path))
+        self._update_status()
+
+    def batal(self):
+        # Antrian dibuang, hasil job yang sedang jalan diabaikan
+        self.cancelled_upto = self.job_counter
+        self._update_status()
+
+    def _cancelled(self, job_id):
+        return job_id <= self.cancelled_upto
+
+    # ---------- worker thread (tanpa akses widget Tk) ----------
+    def _worker(self):
+        while True:
+            job_id, path = self.jobs.get()
+            if self._cancelled(job_id):
+                self.results.put(('finish', job_id, path, None))
+                continue
+            self.results.put(('start', job_id, path, None))
+            try:
+                self.proses_ocr(job_id, path)
+            except Exception as e:
+                self.results.put(('error', job_id, path, str(e)))
+            self.results.put(('finish', job_id, path, None))
+
+    def proses_ocr(self, job_id, path):
+        # Gambar di-decode sekali dan dipakai untuk preview maupun OCR
+        opts = {'cache': self.cache, 'preprocess': self.preprocess}
+        if is_document(path):
+            def run_page(index, page):
+                if index == 0:
+                    self._post_preview(job_id, page)
+                if self._cancelled(job_id):
+                    return index, None
+                return index, ocr_image(page, **opts)
+
+            for index, text in map_pages(run_page, path):
+                if self._cancelled(job_id):
+                    return
+                self.results.put(('text', job_id, path, f"--- Page {index + 1} ---\n{text}\n"))
+        else:
+            with Image.open(path) as img:
+                img.load()
+                self._post_preview(job_id, img)
+                text = ocr_image(img, **opts)
+            self.results.put(('text', job_id, path, text))
+
+    def _post_preview(self, job_id, img):
+        # Image Preview (Resize Fit to Display); PhotoImage dibuat di main thread
+        thumb = img.copy()
+        thumb.thumbnail((200, 200))
+        self.results.put(('preview', job_id, None, thumb))
+
+    # ---------- main thread ----------
+    def _poll_results(self):
+        while True:
+            try:
+                kind, job_id, path, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'finish':
+                self.pending -= 1
+                self.current = None
+            elif self._cancelled(job_id):
+                continue
+            elif kind == 'start':
+                self.current = os.path.basename(path)
+                if self.pending > 1 or self.text_result.get(1.0, 'end-1c'):
+                    self.text_result.insert(tk.END, f"=== {self.current} ===\n")
+            elif kind == 'preview':
+                img_display = ImageTk.PhotoImage(value)
+                self.canvas.config(image=img_display)
+                self.canvas.image = img_display
+            elif kind == 'text':
+                self.text_result.insert(tk.END, value)
+            elif kind == 'error':
+                self.text_result.insert(tk.END, f"Failed: {value}\n")
+        self._update_status()
+        self.root.after(POLL_MS, self._poll_results)
+
+    def _update_status(self):
+        waiting = self.pending - (1 if self.current else 0)
+        parts = []
+        if self.current:
+            parts.append(f"Processing: {self.current}")
+        if waiting > 0:
+            parts.append(f"Queue: {waiting}")
+        if self.cache:
+            parts.append(f"Cache: {self.cache.hits} hit / {self.cache.misses} miss")
+        self.label_status.config(text=" | ".join(parts))
+        busy = self.pending > 0 and self.cancelled_upto < self.job_counter
+        self.btn_cancel.config(state="normal" if busy else "disabled")
 
     def salin_teks(self):
         content = self.text_result.get(1.0, tk.END)
@@ -58,7 +748,200 @@ class OCRApp:
         self.root.clipboard_append(content)
         messagebox.showinfo("Ok", "Copied to clipboard!")
 
-if __name__ == "__main__":
+# ===================== BATCH (HEADLESS) =====================
+BATCH_FIELDS = ['path', 'page', 'text', 'error', 'cached', 'mean_conf', 'needs_review', 'seconds']
+
+def iter_tasks(target):
+    # (path, page index) -- dokumen dipecah per halaman supaya semua worker kebagian
+    for path in iter_input_files(target, INPUT_EXTS):
+        if not is_document(path):
+            yield path, None
+            continue
+        try:
+            pages = count_pages(path)
+        except Exception:
+            pages = 1  # error dilaporkan oleh worker
+        for index in range(pages):
+            yield path, index
+
+_job_opts = {}
+_job_settings = {'pdf_dpi': PDF_DPI}
+
+def _init_worker(tesseract_cmd, ocr_opts, cache_path, cache_bytes, pdf_dpi):
+    if ocr_opts.get('tile'):
+        Image.MAX_IMAGE_PIXELS = None
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _job_opts.update(ocr_opts)
+    _job_settings['pdf_dpi'] = pdf_dpi
+    # Tiap worker punya koneksi SQLite sendiri ke file cache yang sama
+    _job_opts['cache'] = OCRCache(cache_path, cache_bytes) if cache_path else None
+
+def _page_row(path, index, page, ocr_opts):
+    start = time.perf_counter()
+    row = {'path': path, 'page': None if index is None else index + 1,
+           'text': '', 'error': '', 'cached': False}
+    try:
+        if page is None:
+            page = load_page(path, index or 0, _job_settings['pdf_dpi'])
+        result, row['cached'] = _ocr_image(page, **ocr_opts)
+        if isinstance(result, dict):
+            row.update(result)
+        else:
+            row['text'] = result
+    except Exception as e:
+        row['error'] = str(e)
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+def _ocr_job(task):
+    path, index = task
+    return _page_row(path, index, None, _job_opts)
+
+def _document_rows(path, workers, in_flight, pdf_dpi, ocr_opts):
+    # Satu file: halaman paralel di thread pool, baris ditulis urut halaman
+    document = is_document(path)
+    try:
+        yield from map_pages(lambda index, page: _page_row(path, index if document else None, page, ocr_opts),
+                             path, workers, in_flight, pdf_dpi)
+    except Exception as e:
+        yield {'path': path, 'page': None, 'text': '', 'error': str(e), 'cached': False, 'seconds': 0}
+
+def run_batch(target, output=None, fmt='jsonl', workers=None,
+              cache_path=DEFAULT_CACHE_PATH, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024,
+              pdf_dpi=PDF_DPI, in_flight=None, min_conf=None, review_output=None, **ocr_opts):
+    # One Tesseract thread per job, the pool already keeps every core busy
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    if cache_path:
+        OCRCache(cache_path, cache_bytes).close()  # buat schema sekali sebelum worker start
+    if min_conf is not None:
+        ocr_opts['structured'] = True
+    out = open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+    write_row = make_row_writer(out, fmt, BATCH_FIELDS)
+    review = open(review_output, 'w', encoding='utf-8') if review_output else None
+    done = failed = cached = flagged = 0
+    start = time.perf_counter()
+    pool = None
+    try:
+        if os.path.isfile(target):
+            # Satu file (dokumen atau gambar besar yang di-tile) diproses di proses ini
+            ocr_opts['cache'] = OCRCache(cache_path, cache_bytes) if cache_path else None
+            ocr_opts.setdefault('tile_workers', workers)
+            rows = _document_rows(target, workers, in_flight, pdf_dpi, ocr_opts)
+        else:
+            # Pool sudah memakai semua core -> tile per gambar cukup satu thread
+            ocr_opts.setdefault('tile_workers', 1)
+            initargs = (pytesseract.pytesseract.tesseract_cmd, ocr_opts, cache_path, cache_bytes, pdf_dpi)
+            pool = Pool(workers, initializer=_init_worker, initargs=initargs)
+            rows = pool.imap_unordered(_ocr_job, iter_tasks(target))
+        for row in rows:
+            if min_conf is not None and not row['error']:
+                # Halaman dengan confidence rendah ditandai untuk diproses ulang
+                row['needs_review'] = row['mean_conf'] < min_conf
+                if row['needs_review']:
+                    flagged += 1
+                    if review:
+                        review.write(json.dumps({'path': row['path'], 'page': row['page'],
+                                                 'mean_conf': row['mean_conf']}) + '\n')
+                        review.flush()
+            write_row(row)
+            out.flush()
+            done += 1
+            failed += bool(row['error'])
+            cached += row['cached']
+            if done % 100 == 0:
+                rate = done / (time.perf_counter() - start)
+                print(f"{done} images, {rate:.2f} images/sec", file=sys.stderr)
+    finally:
+        if pool:
+            pool.terminate()
+        if output:
+            out.close()
+        if review:
+            review.close()
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    print(f"Done: {done} images ({failed} failed, {cached} from cache) in {elapsed:.1f}s, "
+          f"{rate:.2f} images/sec", file=sys.stderr)
+    if min_conf is not None:
+        print(f"{flagged} pages below confidence {min_conf}", file=sys.stderr)
+    return done, failed
+
+# ===================== MAIN =====================
+def main(argv=None):
+    global OCR_ENGINE
+    parser = argparse.ArgumentParser(description="OCR with Tesseract. Without --batch the GUI is opened.")
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB',
+                        help="OCR every image/TIFF/PDF in a folder (recursive) or glob pattern, no GUI. "
+                             "A single TIFF/PDF file is streamed page by page in order")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument('--lang', default=OCR_LANG)
+    parser.add_argument('--config', default='', help="extra Tesseract config, ex: '--psm 6'")
+    parser.add_argument('--tesseract-cmd', help="path to the tesseract binary")
+    parser.add_argument('--engine', choices=['auto'] + list(ENGINES), default=OCR_ENGINE,
+                        help="OCR backend (auto: tesserocr if installed, else pytesseract)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="SQLite result cache file")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_MB, help="cache limit in MB")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--preprocess', default='',
+                        help="comma separated stages: " + ','.join(PREPROCESS_STAGES) + " (or 'all')")
+    parser.add_argument('--target-dpi', type=int, default=300)
+    parser.add_argument('--tile', type=int, default=None, metavar='PX',
+                        help="OCR large images as overlapping PX x PX tiles in parallel")
+    parser.add_argument('--overlap', type=int, default=TILE_OVERLAP, help="tile overlap in px")
+    parser.add_argument('--roi', default=None, metavar='X0,Y0,X1,Y1',
+                        help="only OCR this rectangle (px) of every image/page")
+    parser.add_argument('--structured', action='store_true',
+                        help="output words, lines, boxes and confidence per page (JSONL)")
+    parser.add_argument('--min-conf', type=float, default=None,
+                        help="flag pages whose mean word confidence is below this (implies --structured)")
+    parser.add_argument('--review-output', help="also list flagged pages in this JSONL file")
+    parser.add_argument('--pdf-dpi', type=int, default=PDF_DPI, help="PDF rasterisation DPI")
+    parser.add_argument('--in-flight', type=int, default=None,
+                        help="max pages in memory for a single document (default: 2x workers)")
+    parser.add_argument('--source-dpi', type=int, default=None,
+                        help="override the input DPI used by the downscale stage")
+    args = parser.parse_args(argv)
+
+    try:
+        preprocess = Preprocess.parse(args.preprocess, target_dpi=args.target_dpi,
+                                      source_dpi=args.source_dpi)
+    except ValueError as e:
+        parser.error(str(e))
+    roi = None
+    if args.roi:
+        try:
+            roi = tuple(int(v) for v in args.roi.split(','))
+        except ValueError:
+            roi = ()
+        if len(roi) != 4 or roi[0] >= roi[2] or roi[1] >= roi[3]:
+            parser.error("--roi must be X0,Y0,X1,Y1 with X0 < X1 and Y0 < Y1")
+    if args.tile:
+        # Gambar besar (poster, gambar teknik) memang melebihi batas decompression bomb PIL
+        Image.MAX_IMAGE_PIXELS = None
+
+    OCR_ENGINE = args.engine
+    if args.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = args.tesseract_cmd
+
+    if args.batch:
+        run_batch(args.batch, args.output, args.format, args.workers,
+                  cache_path=None if args.no_cache else args.cache,
+                  cache_bytes=args.cache_size * 1024 * 1024,
+                  pdf_dpi=args.pdf_dpi, in_flight=args.in_flight,
+                  min_conf=args.min_conf, review_output=args.review_output,
+                  lang=args.lang, config=args.config, engine=args.engine,
+                  preprocess=preprocess, roi=roi, tile=args.tile, overlap=args.overlap,
+                  structured=args.structured)
+        return
+
     root = tk.Tk()
-    app = OCRApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = OCRApp(root, preprocess=preprocess)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
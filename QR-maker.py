@@ -1,12 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import qrcode
+import queue
+import threading
 from datetime import datetime
-from PIL import Image, ImageTk
+from PIL import ImageTk
+
+import qr_core
+from qr_core import make_qr_safe_logo
 
 # ===================== GLOBAL =====================
-qr_image = None
+qr_params = None  # (data, logo, size, ratio) dari Preview terakhir; dirender ulang saat Save
 qr_photo = None
+PREVIEW_SIZE = 260
+DEBOUNCE_MS = 300  # tunggu jeda ketik sebelum render live preview
+POLL_MS = 50
+
+preview_gen = 0          # naik tiap request; hasil dengan gen lama dibuang
+preview_after_id = None
+render_jobs = queue.Queue()
+render_results = queue.Queue()
 
 # ===================== CONTEXT MENU =====================
 def create_context_menu(widget):
@@ -24,157 +36,129 @@ def create_context_menu(widget):
     widget.bind("<Control-Button-1>", show_menu)
 
 # ===================== BUILD QR DATA =====================
+def read_datetime(year, month, day, hour, minute, error):
+    try:
+        if all([year.get(), month.get(), day.get(), hour.get(), minute.get()]):
+            return datetime(int(year.get()), int(month.get()), int(day.get()),
+                            int(hour.get()), int(minute.get()))
+        return None
+    except:
+        raise ValueError(error)
+
 def build_qr_data():
+    # Form -> payload lewat qr_core (GUI hanya membaca widget)
     qr_type = qr_choice.get()
     if qr_type == "Link":
-        data = link_entry.get().strip()
-        if not data:
-            raise ValueError("Link tidak boleh kosong")
-        return data
+        return qr_core.build_link(link_entry.get())
     elif qr_type == "Kontak":
-        name = name_entry.get().strip()
-        wa = wa_entry.get().strip()
-        if not name:
-            raise ValueError("Nama kontak wajib diisi")
-        if wa and not wa.startswith("62"):
-            raise ValueError("No WhatsApp harus diawali 62")
-        address = address_text.get("1.0", "end").strip()
-        vcard = f"""BEGIN:VCARD
-VERSION:3.0
-N:{name}
-FN:{name}
-"""
-        if wa:
-            vcard += f"TEL:+{wa}\nURL:https://wa.me/{wa}\n"
-        if email_entry.get():
-            vcard += f"EMAIL:{email_entry.get()}\n"
-        if address:
-            vcard += f"ADR:;;{address};;;;\n"
-        if maps_entry.get():
-            vcard += f"URL:{maps_entry.get()}\n"
-        vcard += "END:VCARD"
-        return vcard
+        return qr_core.build_vcard(
+            name_entry.get(), wa_entry.get(), email_entry.get(),
+            address_text.get("1.0", "end"), maps_entry.get())
     elif qr_type == "Event":
-        title = event_title_entry.get().strip()
-        if not title:
+        if not event_title_entry.get().strip():
             raise ValueError("Judul Event wajib diisi")
-
         # Mulai
-        try:
-            if all([start_year_entry.get(), start_month.get(), start_day.get(),
-                    start_hour.get(), start_minute.get()]):
-                start = datetime(
-                    int(start_year_entry.get()),
-                    int(start_month.get()),
-                    int(start_day.get()),
-                    int(start_hour.get()),
-                    int(start_minute.get())
-                )
-            else:
-                start = None
-        except:
-            raise ValueError("Format tanggal mulai salah")
-
+        start = read_datetime(start_year_entry, start_month, start_day, start_hour, start_minute,
+                              "Format tanggal mulai salah")
         # Selesai
-        try:
-            if all([end_year_entry.get(), end_month.get(), end_day.get(),
-                    end_hour.get(), end_minute.get()]):
-                end = datetime(
-                    int(end_year_entry.get()),
-                    int(end_month.get()),
-                    int(end_day.get()),
-                    int(end_hour.get()),
-                    int(end_minute.get())
-                )
-            else:
-                end = None
-        except:
-            raise ValueError("Format tanggal selesai salah")
-
-        loc = location_entry.get().strip()
-        desc = desc_text.get("1.0", "end").strip()
-
-        # Build vCalendar
-        event_text = "BEGIN:VCALENDAR\nVERSION:2.0\nBEGIN:VEVENT\n"
-        event_text += f"SUMMARY:{title}\n"
-        if start:
-            event_text += f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}\n"
-        if end:
-            event_text += f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}\n"
-        if loc:
-            event_text += f"LOCATION:{loc}\n"
-        if desc:
-            event_text += f"DESCRIPTION:{desc}\n"
-        event_text += "END:VEVENT\nEND:VCALENDAR"
-        return event_text
-
-# ===================== QR WITH SAFE LOGO =====================
-def make_qr_safe_logo(data, logo_path=None, qr_size=500, logo_ratio=0.2):
-    qr_size = min(qr_size, 1500)
-    logo_ratio = min(max(logo_ratio, 0.05), 0.25)  # logo max 25%
-    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H)
-    qr.add_data(data)
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    qr_img = qr_img.resize((qr_size, qr_size))
-
-    if logo_path:
-        logo = Image.open(logo_path)
-        if logo.mode != "RGBA":
-            logo = logo.convert("RGBA")
-
-        # Buat space lebih besar dari logo untuk keamanan scan
-        safe_ratio = logo_ratio * 1.2
-        safe_size = int(qr_size * safe_ratio)
-        x0 = (qr_size - safe_size) // 2
-        y0 = (qr_size - safe_size) // 2
-        x1 = x0 + safe_size
-        y1 = y0 + safe_size
-
-        for x in range(x0, x1):
-            for y in range(y0, y1):
-                qr_img.putpixel((x, y), (255, 255, 255))
-
-        # Resize logo agar pas di safe space
-        logo_size = int(qr_size * logo_ratio)
-        logo.thumbnail((logo_size, logo_size))
-        x_logo = (qr_size - logo.size[0]) // 2
-        y_logo = (qr_size - logo.size[1]) // 2
-        qr_img.paste(logo, (x_logo, y_logo), mask=logo)
-
-    return qr_img
-
-
+        end = read_datetime(end_year_entry, end_month, end_day, end_hour, end_minute,
+                            "Format tanggal selesai salah")
+        return qr_core.build_vevent(
+            event_title_entry.get(), start, end,
+            location_entry.get(), desc_text.get("1.0", "end"))
 
 # ===================== PREVIEW =====================
-def preview_qr():
-    global qr_image, qr_photo
+def read_params():
+    # Dibaca di thread Tk; render sendiri jalan di worker
+    data = build_qr_data()
+    qr_size_val = int(qr_size_entry.get() or 500)
+    logo_ratio_val = float(logo_size_entry.get() or 0.2)
+    return data, logo_path_var.get(), qr_size_val, logo_ratio_val
+
+def request_preview(show_errors=True):
+    global preview_gen, preview_after_id, qr_params
+    preview_after_id = None
+    # Naik juga saat input tidak valid: render yang masih jalan untuk input lama ikut dibuang
+    preview_gen += 1
     try:
-        data = build_qr_data()
-        qr_size_val = int(qr_size_entry.get() or 500)
-        logo_ratio_val = float(logo_size_entry.get() or 0.2)
-        qr_image = make_qr_safe_logo(data, logo_path_var.get(), qr_size=qr_size_val, logo_ratio=logo_ratio_val)
-        preview = qr_image.resize((260, 260))
-        qr_photo = ImageTk.PhotoImage(preview)
-        qr_label.config(image=qr_photo, text="")
+        params = read_params()
     except Exception as e:
-        messagebox.showerror("Error", str(e))
+        qr_params = None  # Save tidak boleh menulis payload lama
+        if show_errors:
+            messagebox.showerror("Error", str(e))
+        else:
+            preview_status.config(text=str(e))  # saat mengetik: jangan munculkan dialog
+        return
+    render_jobs.put((preview_gen, params, show_errors))
+
+def preview_qr():
+    request_preview(show_errors=True)
+
+def schedule_preview(event=None):
+    # Debounce: setiap perubahan menunda render DEBOUNCE_MS lagi
+    global preview_after_id
+    if not live_var.get():
+        return
+    if preview_after_id is not None:
+        root.after_cancel(preview_after_id)
+    preview_after_id = root.after(DEBOUNCE_MS, lambda: request_preview(show_errors=False))
+
+def render_worker():
+    while True:
+        job = render_jobs.get()
+        # Hanya request terbaru yang dirender
+        while True:
+            try:
+                job = render_jobs.get_nowait()
+            except queue.Empty:
+                break
+        gen, params, show_errors = job
+        data, logo, _, ratio = params
+        try:
+            # Preview langsung di 260 px; resolusi penuh hanya saat Save
+            img = make_qr_safe_logo(data, logo, qr_size=PREVIEW_SIZE, logo_ratio=ratio)
+            render_results.put((gen, params, img, None, show_errors))
+        except Exception as e:
+            render_results.put((gen, params, None, e, show_errors))
+
+def poll_preview():
+    global qr_params, qr_photo
+    try:
+        while True:
+            gen, params, img, error, show_errors = render_results.get_nowait()
+            if gen != preview_gen:
+                continue  # input sudah berubah lagi
+            if error is not None:
+                if show_errors:
+                    messagebox.showerror("Error", str(error))
+                else:
+                    preview_status.config(text=str(error))
+                continue
+            qr_params = params
+            qr_photo = ImageTk.PhotoImage(img)
+            qr_label.config(image=qr_photo, text="")
+            preview_status.config(text="")
+    except queue.Empty:
+        pass
+    root.after(POLL_MS, poll_preview)
 
 # ===================== SAVE AS =====================
 def save_as_qr():
-    global qr_image
-    if qr_image is None:
+    if qr_params is None:
         messagebox.showwarning("Peringatan", "Klik Preview terlebih dahulu")
         return
     file_path = filedialog.asksaveasfilename(
         defaultextension=".png",
-        filetypes=[("PNG Image", "*.png"), ("JPG Image", "*.jpg")],
+        filetypes=[("PNG Image", "*.png"), ("JPG Image", "*.jpg"),
+                   ("SVG (vektor)", "*.svg"), ("PDF (vektor)", "*.pdf")],
         title="Save QR Code As"
     )
     if not file_path:
         return
     try:
-        qr_image.save(file_path)
+        # Render di resolusi akhir / format vektor sesuai ekstensi
+        data, logo, size, ratio = qr_params
+        qr_core.save_qr(file_path, data, logo, qr_size=size, logo_ratio=ratio)
         messagebox.showinfo("Sukses", f"QR berhasil disimpan:\n{file_path}")
     except Exception as e:
         messagebox.showerror("Error", str(e))
@@ -344,6 +328,11 @@ preview_frame.grid(row=4, column=1, sticky="nsew", padx=10, pady=10)
 tk.Label(preview_frame, text="Preview QR", font=("Arial", 12, "bold")).pack(pady=10)
 qr_label = tk.Label(preview_frame, text="Belum ada preview", fg="gray")
 qr_label.pack(expand=True)
+preview_status = tk.Label(preview_frame, text="", fg="red", wraplength=300)
+preview_status.pack(pady=5)
+live_var = tk.IntVar(value=1)
+tk.Checkbutton(preview_frame, text="Live Preview", variable=live_var,
+               command=schedule_preview).pack(pady=5)
 
 # ===================== BUTTONS =====================
 btn_frame = tk.Frame(root)
@@ -354,5 +343,12 @@ tk.Button(btn_frame, text="Save As...", command=save_as_qr, width=15,
           bg="#1976D2", fg="white", font=("Arial", 11, "bold")).pack(side="left", padx=10)
 
 # ===================== INIT =====================
+# Live preview: semua perubahan field -> render ter-debounce di worker thread
+root.bind_all("<KeyRelease>", schedule_preview, add="+")
+root.bind_all("<<ComboboxSelected>>", schedule_preview, add="+")
+logo_path_var.trace_add("write", lambda *_: schedule_preview())
+threading.Thread(target=render_worker, daemon=True).start()
+root.after(POLL_MS, poll_preview)
+
 show_frame()
 root.mainloop()
@@ -1,13 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
-import json, base64
-import qrcode
-from PIL import Image, ImageTk, ImageDraw
-from datetime import datetime, timezone, timedelta
+from PIL import ImageTk
+from datetime import datetime
 
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.exceptions import InvalidSignature
+import qr_sign_core
 
 # ================= ROOT & VAR ================= #
 root = tk.Tk()
@@ -19,16 +15,19 @@ logo_path = tk.StringVar()
 logo_opacity = tk.IntVar(value=255)
 privkey_path = tk.StringVar()
 pubkey_path = tk.StringVar()
+revocation_path = tk.StringVar()
 
 qr_color = "#000000"
 bg_color = "#FFFFFF"
 
 qr_image = None
 qr_preview = None
+revocations = None
 
 add_timestamp = tk.IntVar(value=0)
 tz_var = tk.StringVar(value="UTC")
 add_expiration = tk.IntVar(value=0)
+compact_format = tk.IntVar(value=0)
 
 # ================= RIGHT CLICK ================= #
 def add_right_click_menu(widget):
@@ -40,34 +39,6 @@ def add_right_click_menu(widget):
     menu.add_command(label="Select All", command=lambda: widget.tag_add("sel", "1.0", "end"))
     widget.bind("<Button-3>", lambda e: menu.tk_popup(e.x_root, e.y_root))
 
-# ================= LOGO =================
-def add_logo_safe(qr_img):
-    qr_img = qr_img.convert("RGBA")
-    w, h = qr_img.size
-
-    if logo_mode.get() == 1 or not logo_path.get():
-        return qr_img.convert("RGB")
-
-    logo = Image.open(logo_path.get()).convert("RGBA")
-    size = int(w * 0.20)
-    logo = logo.resize((size, size), Image.LANCZOS)
-
-    alpha = logo.split()[3].point(lambda _: logo_opacity.get())
-    logo.putalpha(alpha)
-
-    if logo_mode.get() == 3:
-        safe = int(size * 1.1)
-        mask = Image.new("RGBA", qr_img.size, (255,255,255,0))
-        draw = ImageDraw.Draw(mask)
-        draw.rectangle(
-            [(w-safe)//2,(h-safe)//2,(w+safe)//2,(h+safe)//2],
-            fill=(255,255,255,255)
-        )
-        qr_img = Image.alpha_composite(qr_img, mask)
-
-    qr_img.paste(logo, ((w-size)//2,(h-size)//2), logo)
-    return qr_img.convert("RGB")
-
 # ================= LOAD KEY =================
 def load_private_key():
     p = filedialog.askopenfilename(filetypes=[("PEM File","*.pem")])
@@ -77,6 +48,27 @@ def load_public_key():
     p = filedialog.askopenfilename(filetypes=[("PEM File","*.pem")])
     if p: pubkey_path.set(p)
 
+def load_revocation_list():
+    p = filedialog.askopenfilename(filetypes=[("Revocation List","*.sqlite3 *.db"),("All","*.*")])
+    if p: revocation_path.set(p)
+
+def get_revocations():
+    # Satu RevocationList per file; Bloom filter dibangun sekali, update dibaca inkremental
+    global revocations
+    path = revocation_path.get()
+    if not path:
+        return None
+    if revocations is None or revocations.path != path:
+        if revocations is not None:
+            revocations.close()
+        revocations = qr_sign_core.RevocationList(path)
+    return revocations
+
+def load_key_folder():
+    # Folder PEM banyak penerbit: key dipilih dari kid di payload
+    p = filedialog.askdirectory(title="Public Key Folder")
+    if p: pubkey_path.set(p)
+
 def pick_qr_color():
     global qr_color
     c = colorchooser.askcolor(title="QR COLOUR")[1]
@@ -90,52 +82,27 @@ def preview_qr():
         if not data: raise ValueError("required")
         if not privkey_path.get(): raise ValueError("Private key is not loaded")
 
-        payload = {"data": data}
-
-        if doc_id_entry.get(): payload["doc_id"] = doc_id_entry.get()
-        if created_by_entry.get(): payload["created_by"] = created_by_entry.get()
-
-        tz = timezone.utc
-        if tz_var.get()=="WIB": tz=timezone(timedelta(hours=7))
-        if tz_var.get()=="WITA": tz=timezone(timedelta(hours=8))
-        if tz_var.get()=="WIT": tz=timezone(timedelta(hours=9))
-
-        now = None
-        if add_timestamp.get():
-            now = datetime.now(tz)
-            payload["timestamp"] = now.isoformat()
-
-        if add_expiration.get() and now:
+        exp = None
+        if add_expiration.get() and add_timestamp.get():
             exp = datetime(
                 dt_exp_year.get(),
                 dt_exp_month.get(),
                 dt_exp_day.get(),
                 dt_exp_hour.get(),
-                dt_exp_minute.get(),
-                tzinfo=tz
+                dt_exp_minute.get()
             )
-            payload["expires_at"] = exp.isoformat()
-
-        sign_bytes = json.dumps(payload,separators=(",",":"),ensure_ascii=False).encode()
-
-        with open(privkey_path.get(),"rb") as f:
-            priv = serialization.load_pem_private_key(f.read(),password=None)
-
-        payload["signature"] = base64.b64encode(
-            priv.sign(sign_bytes, ec.ECDSA(hashes.SHA256()))
-        ).decode()
+        payload = qr_sign_core.build_payload(
+            data, doc_id_entry.get(), created_by_entry.get(),
+            add_timestamp.get(), tz_var.get(), exp)
 
-        qr = qrcode.QRCode(
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=12,
-            border=4
-        )
-        qr.add_data(json.dumps(payload,ensure_ascii=False))
-        qr.make(fit=True)
+        # Key di-parse sekali, dibaca ulang hanya bila file berubah
+        priv = qr_sign_core.get_private_key(privkey_path.get())
+        fmt = qr_sign_core.FORMAT_COMPACT if compact_format.get() else qr_sign_core.FORMAT_JSON
+        text, payload = qr_sign_core.sign_to_qr_text(payload, priv, fmt)
 
-        qr_image = add_logo_safe(
-            qr.make_image(fill_color=qr_color, back_color=bg_color).convert("RGB")
-        )
+        qr_image = qr_sign_core.make_signed_qr(
+            text, qr_color, bg_color,
+            logo_mode.get(), logo_path.get(), logo_opacity.get())
 
         qr_preview = ImageTk.PhotoImage(qr_image.resize((320,320)))
         qr_label.config(image=qr_preview)
@@ -146,23 +113,25 @@ def preview_qr():
 # ================= VERIFY ================= #
 def verify_qr():
     try:
-        payload = json.loads(verify_text.get("1.0","end"))
-        sig = base64.b64decode(payload.pop("signature"))
-
-        verify_bytes = json.dumps(payload,separators=(",",":"),ensure_ascii=False).encode()
-
-        with open(pubkey_path.get(),"rb") as f:
-            pub = serialization.load_pem_public_key(f.read())
-
-        pub.verify(sig, verify_bytes, ec.ECDSA(hashes.SHA256()))
+        pub = qr_sign_core.load_verification_keys(pubkey_path.get())
+        status, reason, payload = qr_sign_core.verify_qr_text(
+            verify_text.get("1.0","end"), pub, revocations=get_revocations())
+
+        if status == qr_sign_core.ERROR:
+            raise ValueError(reason)
+        if status == qr_sign_core.INVALID:
+            verify_result.config(text="❌ INVALID", fg="red")
+            return
+        if status == qr_sign_core.REVOKED:
+            verify_result.config(text=f"⛔ REVOKED\nDocument ID: {payload.get('doc_id')}", fg="red")
+            return
 
         text = "✅ VALID\n"
         color = "green"
 
         if "expires_at" in payload:
             exp = datetime.fromisoformat(payload["expires_at"])
-            now = datetime.now(exp.tzinfo)
-            if now > exp:
+            if status == qr_sign_core.EXPIRED:
                 text += f"⛔ Expires on: {exp}\n"
                 color = "red"
             else:
@@ -170,8 +139,6 @@ def verify_qr():
 
         verify_result.config(text=text, fg=color)
 
-    except InvalidSignature:
-        verify_result.config(text="❌ INVALID", fg="red")
     except Exception as e:
         messagebox.showerror("Error", str(e))
 
@@ -262,6 +229,10 @@ tk.Scale(frame_h,from_=50,to=255,variable=logo_opacity,
          orient="horizontal",label="Logo Opacity")\
     .grid(row=4,column=3,columnspan=2)
 
+# Compact: CBOR + Base45, QR lebih kecil (verifier mendeteksi otomatis)
+tk.Checkbutton(frame_h,text="Compact Format",variable=compact_format)\
+    .grid(row=6,column=3,sticky="w")
+
 tk.Button(left,text="Preview QR",command=preview_qr).pack(pady=5)
 tk.Button(left,text="Save QR",command=preview_qr).pack(pady=5)
 
@@ -277,6 +248,11 @@ verify_text.pack(fill="x",padx=10,pady=10)
 
 tk.Entry(tab_v,textvariable=pubkey_path).pack(fill="x",padx=10)
 tk.Button(tab_v,text="Browse Public Key",command=load_public_key).pack()
+tk.Button(tab_v,text="Browse Key Folder",command=load_key_folder).pack()
+
+tk.Label(tab_v,text="Revocation List (optional)").pack(anchor="w",padx=10)
+tk.Entry(tab_v,textvariable=revocation_path).pack(fill="x",padx=10)
+tk.Button(tab_v,text="Browse Revocation List",command=load_revocation_list).pack()
 
 tk.Button(tab_v,text="VERIFY",font=("Arial",12,"bold"),
           bg="#4CAF50",fg="white",command=verify_qr).pack(pady=20)
@@ -0,0 +1,114 @@
+import csv
+import glob
+import json
+import os
+import sys
+import time
+import zipfile
+
+# Input / output batch tanpa Tk, dipakai bersama qr_cli.py, qr_sign_cli.py dan OCR.py
+
+# ===================== INPUT =====================
+def iter_records(path):
+    # -> (row number, record dict atau Exception); baris dibaca lazy
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for row_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_no, json.loads(line)
+                except ValueError as e:
+                    yield row_no, ValueError(f"JSON tidak valid: {e}")
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row_no, record in enumerate(csv.DictReader(f), 2):  # baris 1 = header
+                yield row_no, record
+
+def iter_input_files(target, exts):
+    # Folder -> walk recursively, selain itu dianggap glob pattern
+    if os.path.isdir(target):
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(exts):
+                    yield os.path.join(dirpath, name)
+    else:
+        for path in sorted(glob.glob(target, recursive=True)):
+            if os.path.isfile(path) and path.lower().endswith(exts):
+                yield path
+
+# ===================== OUTPUT =====================
+def make_row_writer(out, fmt, fields):
+    # -> fungsi tulis satu baris report (CSV kolom `fields`, selain itu JSONL)
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        return writer.writerow
+    return lambda row: out.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+class BulkOutput:
+    # Hasil bulk ke ZIP atau folder (ditulis begitu selesai), baris gagal ke CSV, progress ke stderr
+    def __init__(self, zip_path=None, out_dir=None, errors_path=None, compression=zipfile.ZIP_STORED,
+                 done_label="codes", rate_label="codes/sec", progress_every=500):
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.zf = zipfile.ZipFile(zip_path, "w", compression) if zip_path else None
+        self.errors = open(errors_path, "w", newline="", encoding="utf-8") if errors_path else None
+        self.error_writer = csv.writer(self.errors) if self.errors else None
+        if self.error_writer:
+            self.error_writer.writerow(["row", "error"])
+        self.done_label = done_label
+        self.rate_label = rate_label
+        self.progress_every = progress_every
+        self.names = set()
+        self.ok = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+
+    def fail(self, row_no, error):
+        self.failed += 1
+        print(f"row {row_no}: {error}", file=sys.stderr)
+        if self.error_writer:
+            self.error_writer.writerow([row_no, error])
+
+    def write(self, row_no, name, body):
+        # -> nama file yang dipakai; nama kembar diberi akhiran nomor baris
+        if name in self.names:
+            base, ext = os.path.splitext(name)
+            name = f"{base}_{row_no}{ext}"
+        self.names.add(name)
+        self.add_file(name, body)
+        self.ok += 1
+        if self.ok % self.progress_every == 0:
+            rate = self.ok / (time.perf_counter() - self.start)
+            print(f"{self.ok} {self.done_label}, {rate:.1f} {self.rate_label}", file=sys.stderr)
+        return name
+
+    def add_file(self, name, body):
+        if self.zf:
+            self.zf.writestr(name, body)
+        else:
+            with open(os.path.join(self.out_dir, name), "wb") as f:
+                f.write(body)
+
+    def close(self):
+        if self.zf:
+            self.zf.close()
+        if self.errors:
+            self.errors.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def finish(self):
+        # Ringkasan ke stderr -> exit code (2 bila ada baris gagal)
+        elapsed = time.perf_counter() - self.start
+        rate = self.ok / elapsed if elapsed else 0.0
+        print(f"Done: {self.ok} {self.done_label} ({self.failed} failed rows) in {elapsed:.1f}s, "
+              f"{rate:.1f} {self.rate_label}", file=sys.stderr)
+        return 0 if not self.failed else 2
@@ -0,0 +1,102 @@
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+import pytesseract
+
+import OCR
+
+# Benchmark latency per gambar: pytesseract (subprocess per gambar) vs tesserocr (C-API persisten)
+# ex: python bench_ocr_engine.py --images "scans/*.jpg" --runs 3
+
+SAMPLE_LINES = [
+    "INVOICE No. 2024/INV/00123",
+    "Tanggal: 12 Maret 2024",
+    "Total Pembayaran: Rp 1.250.000",
+    "Thank you for your purchase",
+]
+
+# ===================== SAMPLES =====================
+def make_sample_images(count=10, size=(1240, 400)):
+    font = ImageFont.load_default(size=36)
+    samples = []
+    for i in range(count):
+        img = Image.new("RGB", size, "white")
+        draw = ImageDraw.Draw(img)
+        lines = SAMPLE_LINES[i % len(SAMPLE_LINES):] + SAMPLE_LINES[:i % len(SAMPLE_LINES)]
+        for row, line in enumerate(lines):
+            draw.text((40, 30 + row * 85), line, fill="black", font=font)
+        samples.append((img, "\n".join(lines)))
+    return samples
+
+def load_samples(pattern=None, count=10):
+    # (image, ground truth) -- ground truth dari file .txt dengan nama sama, kalau ada
+    if not pattern:
+        return make_sample_images(count)
+    samples = []
+    for path in sorted(glob.glob(pattern)):
+        if not path.lower().endswith(OCR.IMAGE_EXTS):
+            continue
+        txt = os.path.splitext(path)[0] + ".txt"
+        truth = open(txt, encoding="utf-8").read() if os.path.exists(txt) else None
+        with Image.open(path) as img:
+            img.load()
+            samples.append((img, truth))
+    return samples
+
+# ===================== BENCH =====================
+def bench_engine(name, images, runs, lang, config):
+    start = time.perf_counter()
+    engine = OCR.ENGINES[name](lang, config)
+    engine.image_to_string(images[0])
+    cold = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(runs):
+        for img in images:
+            t0 = time.perf_counter()
+            engine.image_to_string(img)
+            latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return {
+        "engine": name,
+        "cold_ms": cold * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "images_per_sec": len(latencies) / sum(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-image OCR latency of the available backends")
+    parser.add_argument("--images", help="glob of sample images (default: synthetic text images)")
+    parser.add_argument("--count", type=int, default=10, help="number of synthetic images")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--lang", default=OCR.OCR_LANG)
+    parser.add_argument("--config", default="")
+    parser.add_argument("--tesseract-cmd")
+    args = parser.parse_args()
+
+    if args.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = args.tesseract_cmd
+
+    images = [img for img, _ in load_samples(args.images, args.count)]
+    if not images:
+        raise SystemExit("No sample images found")
+
+    print(f"{len(images)} images x {args.runs} runs, lang={args.lang}")
+    print(f"{'engine':<12}{'cold ms':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'img/s':>10}")
+    for name in OCR.ENGINES:
+        try:
+            r = bench_engine(name, images, args.runs, args.lang, args.config)
+        except Exception as e:
+            print(f"{name:<12}skipped: {e}")
+            continue
+        print(f"{r['engine']:<12}{r['cold_ms']:>10.1f}{r['mean_ms']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['images_per_sec']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import statistics
+import time
+
+import numpy as np
+from PIL import Image
+import pytesseract
+
+import OCR
+from bench_ocr_engine import load_samples
+
+# Benchmark preprocessing: waktu per gambar dan akurasi karakter, tanpa/dengan tiap stage
+# ex: python bench_ocr_preprocess.py --images "samples/*.jpg"   (ground truth: samples/<nama>.txt)
+
+CONFIGS = [
+    ("none", ""),
+    ("gray", "gray"),
+    ("downscale", "downscale"),
+    ("deskew", "deskew"),
+    ("binarize", "binarize"),
+    ("all", "all"),
+]
+
+# ===================== SAMPLES =====================
+def degrade(img, seed):
+    # Simulasi foto HP: resolusi besar, berwarna, noise, sedikit miring
+    rng = np.random.default_rng(seed)
+    w, h = img.size
+    img = img.resize((w * 3, h * 3), Image.BICUBIC)
+    arr = np.asarray(img).astype(np.int16)
+    arr = arr * np.array([0.85, 0.8, 0.7]) + np.array([20, 25, 35])
+    arr = arr + rng.normal(0, 12, arr.shape)
+    img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+    img = img.rotate(rng.uniform(-3, 3), resample=Image.BICUBIC, expand=True, fillcolor=(230, 225, 210))
+    img.info["dpi"] = (450, 450)
+    return img
+
+def char_accuracy(text, truth):
+    # 1 - (edit distance / panjang ground truth), whitespace dinormalisasi
+    a = " ".join(text.split())
+    b = " ".join(truth.split())
+    if not b:
+        return 1.0 if not a else 0.0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return max(0.0, 1 - prev[-1] / len(b))
+
+# ===================== BENCH =====================
+def bench_config(samples, spec, engine, lang, config, target_dpi):
+    options = OCR.Preprocess.parse(spec, target_dpi=target_dpi)
+    prep_times, ocr_times, accuracy = [], [], []
+    for img, truth in samples:
+        t0 = time.perf_counter()
+        ready = OCR.preprocess_image(img, options)
+        t1 = time.perf_counter()
+        text = engine.image_to_string(ready)
+        t2 = time.perf_counter()
+        prep_times.append(t1 - t0)
+        ocr_times.append(t2 - t1)
+        if truth is not None:
+            accuracy.append(char_accuracy(text, truth))
+    return {
+        "prep_ms": statistics.mean(prep_times) * 1000,
+        "ocr_ms": statistics.mean(ocr_times) * 1000,
+        "accuracy": statistics.mean(accuracy) * 100 if accuracy else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and character accuracy per preprocessing stage")
+    parser.add_argument("--images", help="glob of sample images with <name>.txt ground truth "
+                                         "(default: degraded synthetic images)")
+    parser.add_argument("--count", type=int, default=8)
+    parser.add_argument("--engine", default="auto", choices=["auto"] + list(OCR.ENGINES))
+    parser.add_argument("--lang", default=OCR.OCR_LANG)
+    parser.add_argument("--config", default="")
+    parser.add_argument("--target-dpi", type=int, default=300)
+    parser.add_argument("--tesseract-cmd")
+    args = parser.parse_args()
+
+    if args.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = args.tesseract_cmd
+
+    samples = load_samples(args.images, args.count)
+    if not args.images:
+        samples = [(degrade(img, i), truth) for i, (img, truth) in enumerate(samples)]
+    if not samples:
+        raise SystemExit("No sample images found")
+
+    engine = OCR.get_engine(args.engine, args.lang, args.config)
+    print(f"{len(samples)} images, engine={engine.name}, target dpi={args.target_dpi}")
+    print(f"{'stages':<12}{'prep ms':>10}{'ocr ms':>10}{'total ms':>10}{'char acc %':>12}")
+    for label, spec in CONFIGS:
+        r = bench_config(samples, spec, engine, args.lang, args.config, args.target_dpi)
+        acc = f"{r['accuracy']:.1f}" if r["accuracy"] is not None else "-"
+        print(f"{label:<12}{r['prep_ms']:>10.1f}{r['ocr_ms']:>10.1f}"
+              f"{r['prep_ms'] + r['ocr_ms']:>10.1f}{acc:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import tempfile
+import time
+
+import qrcode
+from PIL import Image, ImageDraw
+
+import qr_core
+
+# Micro-benchmark make_qr_safe_logo: versi lama (putpixel per piksel) vs qr_core sekarang,
+# dingin (cache encode + logo dikosongkan tiap run) dan hangat
+# (qr_core merender langsung di resolusi akhir, jadi piksel tepi modul tidak identik dengan versi lama)
+# ex: python bench_qr_logo.py --repeat 5
+
+SIZES = (500, 1000, 1500)
+RATIOS = (0.05, 0.10, 0.15, 0.20, 0.25)
+DATA = "https://example.com/event/2024/registrasi?id=000123"
+
+# ===================== LEGACY =====================
+def make_qr_safe_logo_putpixel(data, logo_path=None, qr_size=500, logo_ratio=0.2):
+    # Salinan implementasi lama sebagai pembanding
+    qr_size = min(qr_size, 1500)
+    logo_ratio = min(max(logo_ratio, 0.05), 0.25)
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H)
+    qr.add_data(data)
+    qr.make(fit=True)
+    qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+    qr_img = qr_img.resize((qr_size, qr_size))
+
+    if logo_path:
+        logo = Image.open(logo_path)
+        if logo.mode != "RGBA":
+            logo = logo.convert("RGBA")
+        safe_size = int(qr_size * logo_ratio * 1.2)
+        x0 = (qr_size - safe_size) // 2
+        y0 = (qr_size - safe_size) // 2
+        for x in range(x0, x0 + safe_size):
+            for y in range(y0, y0 + safe_size):
+                qr_img.putpixel((x, y), (255, 255, 255))
+        logo_size = int(qr_size * logo_ratio)
+        logo.thumbnail((logo_size, logo_size))
+        qr_img.paste(logo, ((qr_size - logo.size[0]) // 2, (qr_size - logo.size[1]) // 2), mask=logo)
+    return qr_img
+
+# ===================== BENCH =====================
+def make_logo(path):
+    logo = Image.new("RGBA", (600, 600), (0, 0, 0, 0))
+    ImageDraw.Draw(logo).ellipse((20, 20, 580, 580), fill=(25, 118, 210, 255))
+    logo.save(path)
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="putpixel safe-zone vs region paste")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--logo", help="logo image (default: generated)")
+    args = parser.parse_args()
+
+    logo = args.logo
+    if not logo:
+        logo = os.path.join(tempfile.gettempdir(), "bench_qr_logo.png")
+        make_logo(logo)
+
+    def cold(size, ratio):
+        # Tanpa cache encode / logo -> sama-sama encode + decode logo seperti versi lama
+        qr_core.clear_encode_cache()
+        qr_core.clear_logo_cache()
+        return qr_core.make_qr_safe_logo(DATA, logo, size, ratio)
+
+    # speedup = putpixel vs cold; warm = payload + logo sudah di cache (preview / bulk)
+    print(f"{'size':>6}{'ratio':>7}{'putpixel ms':>14}{'cold ms':>10}{'warm ms':>10}{'speedup':>9}")
+    for size in SIZES:
+        for ratio in RATIOS:
+            old_ms, _ = best_ms(lambda: make_qr_safe_logo_putpixel(DATA, logo, size, ratio), args.repeat)
+            cold_ms, _ = best_ms(lambda: cold(size, ratio), args.repeat)
+            warm_ms, _ = best_ms(lambda: qr_core.make_qr_safe_logo(DATA, logo, size, ratio), args.repeat)
+            print(f"{size:>6}{ratio:>7.2f}{old_ms:>14.1f}{cold_ms:>10.1f}{warm_ms:>10.1f}{old_ms / cold_ms:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
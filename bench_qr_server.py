@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+# Load test qr_server.py: latency p50/p99 dan requests/sec dengan koneksi keep-alive paralel
+# ex: python bench_qr_server.py --requests 2000 --concurrency 32 --unique 100
+#     python bench_qr_server.py --port 8765          (server yang sudah jalan)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def make_paths(count, unique, size, fmt):
+    # unique = jumlah payload berbeda -> sisanya cache hit
+    return [f"/qr?{urlencode({'type': 'Link', 'link': f'https://example.com/t/{i % unique}', 'size': size, 'format': fmt})}"
+            for i in range(count)]
+
+async def request(reader, writer, host, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+async def client(host, port, paths, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while paths:
+            path = paths.pop()
+            t0 = time.perf_counter()
+            status = await request(reader, writer, host, path)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run(host, port, paths, concurrency):
+    latencies, statuses = [], Counter()
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, latencies, statuses) for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - start
+
+async def wait_ready(host, port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise SystemExit("Server tidak merespons")
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for qr_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="existing server (default: start one on a free port)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--unique", type=int, default=100, help="distinct payloads (rest are cache hits)")
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    parser.add_argument("-j", "--workers", type=int, help="render processes for the spawned server")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        cmd = [sys.executable, os.path.join(HERE, "qr_server.py"), "--host", args.host, "--port", str(port)]
+        if args.workers:
+            cmd += ["-j", str(args.workers)]
+        server = subprocess.Popen(cmd, cwd=HERE, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_ready(args.host, port))
+        paths = make_paths(args.requests, max(1, args.unique), args.size, args.format)
+        latencies, statuses, elapsed = asyncio.run(run(args.host, port, paths, args.concurrency))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    ms = [x * 1000 for x in latencies]
+    print(f"{len(ms)} requests, concurrency {args.concurrency}, {args.unique} unique payloads, "
+          f"{args.format} {args.size}px")
+    print(f"status: {dict(statuses)}")
+    print(f"p50 {pct(ms, 0.50):.1f} ms, p99 {pct(ms, 0.99):.1f} ms, mean {statistics.mean(ms):.1f} ms, "
+          f"max {max(ms):.1f} ms")
+    print(f"{len(ms) / elapsed:.1f} req/s ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
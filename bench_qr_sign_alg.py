@@ -0,0 +1,45 @@
+import argparse
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+import qr_sign_core
+
+# Benchmark signs/sec dan verifies/sec: ECDSA P-256 (ES256) vs Ed25519, lewat fungsi yang dipakai batch
+# (sign_to_qr_text di qr_sign_cli sign, verify_qr_text di qr_sign_cli verify)
+# ex: python bench_qr_sign_alg.py --count 2000
+
+KEYS = {
+    qr_sign_core.ALG_ES256: lambda: ec.generate_private_key(ec.SECP256R1()),
+    qr_sign_core.ALG_ED25519: ed25519.Ed25519PrivateKey.generate,
+}
+FORMATS = (qr_sign_core.FORMAT_JSON, qr_sign_core.FORMAT_COMPACT)
+
+def per_sec(fn, items):
+    t0 = time.perf_counter()
+    results = [fn(item) for item in items]
+    return len(items) / (time.perf_counter() - t0), results
+
+def main():
+    parser = argparse.ArgumentParser(description="Signing / verification throughput per algorithm")
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    payloads = [qr_sign_core.build_payload(f"Sertifikat pelatihan peserta {i}", f"DOC-{i:06d}", "Panitia",
+                                           add_timestamp=True, tz="WIB", expires_at="2030-12-31 23:59")
+                for i in range(args.count)]
+    print(f"{args.count} payloads")
+    print(f"{'alg':<9}{'format':<9}{'chars':>7}{'signs/sec':>12}{'verifies/sec':>14}")
+    for alg, make_key in KEYS.items():
+        key = make_key()
+        public_key = key.public_key()
+        for fmt in FORMATS:
+            sign_rate, signed = per_sec(lambda p: qr_sign_core.sign_to_qr_text(p, key, fmt)[0], payloads)
+            verify_rate, results = per_sec(lambda t: qr_sign_core.verify_qr_text(t, public_key)[0], signed)
+            if any(status != qr_sign_core.VALID for status in results):
+                raise SystemExit(f"{alg}/{fmt}: verification failed")
+            chars = sum(map(len, signed)) / len(signed)
+            print(f"{alg:<9}{fmt:<9}{chars:>7.0f}{sign_rate:>12.0f}{verify_rate:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import statistics
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+
+import qr_core
+import qr_sign_core
+
+# Benchmark format isi QR bertanda tangan: JSON + DER base64 vs compact (CBOR + r||s + Base45)
+# -> panjang isi, versi QR, waktu render dan waktu decode per ukuran data
+# ex: python bench_qr_sign_format.py --repeat 5
+
+DATA_SIZES = (20, 80, 200, 400)
+FORMATS = (qr_sign_core.FORMAT_JSON, qr_sign_core.FORMAT_COMPACT)
+
+def qr_version(text, mask_pattern=None):
+    return (len(qr_core.encode_qr(text, mask_pattern=mask_pattern)) - 17) // 4
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Signed QR size / render / decode: JSON vs compact")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--key", help="private key PEM (default: fresh P-256 key)")
+    args = parser.parse_args()
+
+    key = qr_sign_core.get_private_key(args.key) if args.key else ec.generate_private_key(ec.SECP256R1())
+    public_key = key.public_key()
+
+    print(f"{'data':>5}{'format':>9}{'chars':>7}{'version':>9}{'render ms':>11}{'decode ms':>11}  verify")
+    for size in DATA_SIZES:
+        payload = qr_sign_core.build_payload(
+            ("Sertifikat No. 0001 atas nama Budi Santoso " * 20)[:size], "DOC-2024-000123", "Panitia",
+            add_timestamp=True, tz="WIB", expires_at="2030-12-31 23:59")
+        for fmt in FORMATS:
+            text, _ = qr_sign_core.sign_to_qr_text(payload, key, fmt)
+
+            def render():
+                qr_core.clear_encode_cache()  # ukur encode penuh, bukan hit memo
+                return qr_sign_core.make_signed_qr(text)
+
+            render_ms, img = timed(render, args.repeat)
+            decode_ms, decoded = timed(lambda: qr_core.decode_qr(img), args.repeat)
+            status = qr_sign_core.verify_qr_text(decoded, public_key)[0] if decoded else "undecodable"
+            print(f"{size:>5}{fmt:>9}{len(text):>7}{qr_version(text):>9}{render_ms:>11.1f}{decode_ms:>11.1f}  {status}")
+
+if __name__ == "__main__":
+    main()
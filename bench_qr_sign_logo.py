@@ -0,0 +1,76 @@
+import argparse
+import os
+import tempfile
+
+from PIL import Image, ImageChops, ImageDraw
+
+import qr_core
+import qr_sign_core
+from bench_qr_logo import best_ms, make_logo
+
+# Micro-benchmark add_logo_safe (QR_Sign): versi lama (lambda opacity per nilai alpha, mask RGBA
+# seukuran kanvas + alpha_composite, RGB->RGBA->RGB) vs qr_sign_core sekarang, untuk kedua mode logo
+# ex: python bench_qr_sign_logo.py --repeat 5
+
+SIZES = (500, 1000, 1500)
+MODES = {"embedded": qr_sign_core.LOGO_EMBEDDED, "whitespace": qr_sign_core.LOGO_WHITE_SPACE}
+OPACITY = 180
+
+# ===================== LEGACY =====================
+def add_logo_safe_legacy(qr_img, logo_mode, logo_path, logo_opacity):
+    # Salinan implementasi lama sebagai pembanding (Tk IntVar diganti fungsi biasa)
+    qr_img = qr_img.convert("RGBA")
+    w, h = qr_img.size
+
+    if logo_mode == 1 or not logo_path:
+        return qr_img.convert("RGB")
+
+    logo = Image.open(logo_path).convert("RGBA")
+    size = int(w * 0.20)
+    logo = logo.resize((size, size), Image.LANCZOS)
+
+    alpha = logo.split()[3].point(lambda _: logo_opacity())
+    logo.putalpha(alpha)
+
+    if logo_mode == 3:
+        safe = int(size * 1.1)
+        mask = Image.new("RGBA", qr_img.size, (255,255,255,0))
+        draw = ImageDraw.Draw(mask)
+        draw.rectangle(
+            [(w-safe)//2,(h-safe)//2,(w+safe)//2,(h+safe)//2],
+            fill=(255,255,255,255)
+        )
+        qr_img = Image.alpha_composite(qr_img, mask)
+
+    qr_img.paste(logo, ((w-size)//2,(h-size)//2), logo)
+    return qr_img.convert("RGB")
+
+# ===================== BENCH =====================
+def main():
+    parser = argparse.ArgumentParser(description="add_logo_safe: legacy vs region-only compositing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--logo", help="logo image (default: generated)")
+    args = parser.parse_args()
+
+    logo = args.logo
+    if not logo:
+        logo = os.path.join(tempfile.gettempdir(), "bench_qr_sign_logo.png")
+        make_logo(logo)
+
+    print(f"{'size':>6}  {'mode':<11}{'legacy ms':>11}{'new ms':>9}{'cold ms':>9}{'speedup':>9}  same")
+    for size in SIZES:
+        base = qr_core.render_modules(qr_core.encode_qr("https://example.com/doc/000123"), size).convert("RGB")
+        for label, mode in MODES.items():
+            old_ms, old = best_ms(lambda: add_logo_safe_legacy(base, mode, logo, lambda: OPACITY), args.repeat)
+
+            def cold():
+                qr_core.clear_logo_cache()
+                return qr_sign_core.add_logo_safe(base.copy(), mode, logo, OPACITY)
+
+            cold_ms, _ = best_ms(cold, args.repeat)
+            new_ms, new = best_ms(lambda: qr_sign_core.add_logo_safe(base.copy(), mode, logo, OPACITY), args.repeat)
+            same = ImageChops.difference(old, new).getbbox() is None
+            print(f"{size:>6}  {label:<11}{old_ms:>11.2f}{new_ms:>9.2f}{cold_ms:>9.2f}{old_ms / new_ms:>8.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Benchmark waktu start CLI QR (tanpa Tk) dibanding import yang dibutuhkan GUI
+# ex: python bench_qr_startup.py --runs 10
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def run_ms(cmd, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=HERE, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure QR CLI startup time")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    out = os.path.join(tempfile.gettempdir(), "bench_qr_startup.png")
+    cases = [
+        ("python (empty)", [sys.executable, "-c", "pass"]),
+        ("import qr_core", [sys.executable, "-c", "import qr_core"]),
+        ("GUI imports (tk + ImageTk)", [sys.executable, "-c",
+                                        "import tkinter, tkinter.ttk, PIL.ImageTk, qr_core"]),
+        ("qr_cli.py link -> png", [sys.executable, "qr_cli.py", "link", "https://example.com", "-o", out]),
+    ]
+    print(f"{'case':<30}{'median ms':>12}{'min ms':>10}")
+    for label, cmd in cases:
+        try:
+            median, best = run_ms(cmd, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"{label:<30}{'failed':>12}")
+            continue
+        print(f"{label:<30}{median:>12.1f}{best:>10.1f}")
+
+if __name__ == "__main__":
+    main()
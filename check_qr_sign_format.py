@@ -0,0 +1,188 @@
+import argparse
+import base64
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+import qr_sign_core
+
+# Cek format compact (Base45 + CBOR + signature mentah): round-trip, vektor RFC 9285, tamper.
+# Format ini yang harus tetap bisa diverifikasi untuk QR yang sudah tercetak -> jalankan setelah
+# mengubah qr_sign_core. Exit code 1 bila ada yang gagal.
+# ex: python check_qr_sign_format.py -v
+
+# RFC 9285 section 4.3 / 4.4
+B45_VECTORS = [
+    (b"AB", "BB8"),
+    (b"Hello!!", "%69 VD92EX0"),
+    (b"base-45", "UJCLQE7W581"),
+    (b"ietf!", "QED8WEX0"),
+    (b"", ""),
+]
+B45_INVALID = ["GGW", "A", "aa", "BB8:", "ZZZZ"]
+
+CBOR_VALUES = [
+    0, 1, 23, 24, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1,
+    -1, -24, -25, -256, -257, -2**32, -2**64,
+    b"", b"\x00\xff" * 40, "", "a", "Sertifikat No. 123 — ĀǕ 漢字 🎓", "x" * 300,
+    {}, {0: "data", 1: "DOC-1", 3: 1700000000, 5: 420, 7: b"\x01" * 8},
+    {0: {1: {2: "nested"}}, -1: -1, 10: b"raw"},
+]
+# Byte CBOR tetap (RFC 8949 appendix A) -> encoder tidak boleh berubah diam-diam
+CBOR_VECTORS = [
+    (0, "00"), (23, "17"), (24, "1818"), (100, "1864"), (1000, "1903e8"), (1000000, "1a000f4240"),
+    (-1, "20"), (-100, "3863"), (-1000, "3903e7"),
+    ("", "60"), ("a", "6161"), ("IETF", "6449455446"), (b"\x01\x02\x03\x04", "4401020304"),
+    ({1: 2, 3: 4}, "a201020304"),
+]
+
+# Key Ed25519 tetap (signature deterministik) -> isi QR compact harus identik byte per byte
+GOLDEN_SEED = bytes(range(32))
+GOLDEN_NOW = datetime(2024, 3, 12, 9, 0, tzinfo=timezone(timedelta(hours=7)))
+GOLDEN_TEXT = ("QS:H90C20J3DSVD1$C080RS87M8U09*S9TH0+*CZ6N0T0F90J 0YY8SF6RW6J9778918A3*F.*0WOGN0FE4HTPQY$"
+               "TVS05IRV BX3DS$TZ2M7LOY8B.PR0Q8V6F:FIKW5DAAQ4GPX1BNS7$O2CWR:P682C/E/ 9VT00UQO/G4/UD0")
+
+class Checker:
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.passed = 0
+        self.failed = 0
+
+    def check(self, name, ok, detail=""):
+        if ok:
+            self.passed += 1
+            if self.verbose:
+                print(f"ok    {name}")
+        else:
+            self.failed += 1
+            print(f"FAIL  {name} {detail}")
+
+    def raises(self, name, fn, exc=ValueError):
+        try:
+            fn()
+        except exc:
+            self.check(name, True)
+        except Exception as e:
+            self.check(name, False, f"-> {type(e).__name__}: {e}")
+        else:
+            self.check(name, False, "-> no error")
+
+def check_base45(c):
+    for raw, text in B45_VECTORS:
+        c.check(f"b45encode {raw!r}", qr_sign_core.b45encode(raw) == text, qr_sign_core.b45encode(raw))
+        c.check(f"b45decode {text!r}", qr_sign_core.b45decode(text) == raw)
+    for text in B45_INVALID:
+        c.raises(f"b45decode rejects {text!r}", lambda: qr_sign_core.b45decode(text))
+    for n in range(0, 70):
+        raw = bytes((i * 37 + n) & 255 for i in range(n))
+        if qr_sign_core.b45decode(qr_sign_core.b45encode(raw)) != raw:
+            c.check(f"base45 round-trip len {n}", False)
+            break
+    else:
+        c.check("base45 round-trip len 0-69", True)
+
+def check_cbor(c):
+    for value in CBOR_VALUES:
+        encoded = qr_sign_core.cbor_dumps(value)
+        c.check(f"cbor round-trip {str(value)[:40]!r}", qr_sign_core.cbor_loads(encoded) == value)
+    for value, hex_bytes in CBOR_VECTORS:
+        got = qr_sign_core.cbor_dumps(value).hex()
+        c.check(f"cbor bytes {value!r}", got == hex_bytes, f"-> {got}")
+    c.check("cbor map key order", qr_sign_core.cbor_dumps({3: 4, 1: 2}) == qr_sign_core.cbor_dumps({1: 2, 3: 4}))
+    c.raises("cbor rejects bool", lambda: qr_sign_core.cbor_dumps(True), TypeError)
+    c.raises("cbor rejects float", lambda: qr_sign_core.cbor_dumps(1.5), TypeError)
+    c.raises("cbor rejects truncated", lambda: qr_sign_core.cbor_loads(bytes.fromhex("6449455446")[:-1]))
+    c.raises("cbor rejects trailing bytes", lambda: qr_sign_core.cbor_loads(bytes.fromhex("0000")))
+    c.raises("cbor rejects float head", lambda: qr_sign_core.cbor_loads(bytes.fromhex("f93c00")))
+
+def tampered(text, flip):
+    # Balik satu bit pada byte ke-`flip` (negatif = dari belakang) setelah decode Base45
+    raw = bytearray(qr_sign_core.b45decode(text[len(qr_sign_core.COMPACT_PREFIX):]))
+    raw[flip] ^= 0x01
+    return qr_sign_core.COMPACT_PREFIX + qr_sign_core.b45encode(bytes(raw))
+
+def check_signed(c, label, private_key):
+    public_key = private_key.public_key()
+    expires = GOLDEN_NOW + timedelta(days=365)
+    payload = qr_sign_core.build_payload("Budi Santoso - Sertifikat Pelatihan", "DOC-0001", "Panitia",
+                                         True, "WIB", expires.replace(tzinfo=None), now=GOLDEN_NOW)
+    now = GOLDEN_NOW + timedelta(days=1)
+    for fmt in (qr_sign_core.FORMAT_COMPACT, qr_sign_core.FORMAT_JSON):
+        text, signed = qr_sign_core.sign_to_qr_text(payload, private_key, fmt)
+        status, reason, decoded = qr_sign_core.verify_qr_text(text, public_key, now=now)
+        c.check(f"{label} {fmt} valid", status == qr_sign_core.VALID, f"-> {status}: {reason}")
+        c.check(f"{label} {fmt} payload round-trip", decoded == signed)
+        status, _, _ = qr_sign_core.verify_qr_text(text, public_key, now=expires + timedelta(seconds=1))
+        c.check(f"{label} {fmt} expired", status == qr_sign_core.EXPIRED, f"-> {status}")
+
+    text, signed = qr_sign_core.sign_to_qr_text(payload, private_key, qr_sign_core.FORMAT_COMPACT)
+    data_at = qr_sign_core.b45decode(text[len(qr_sign_core.COMPACT_PREFIX):]).index(b"Budi")
+    for where, flip in (("data", data_at), ("signature", -1), ("signature start", -qr_sign_core.SIG_SIZE)):
+        status, reason, _ = qr_sign_core.verify_qr_text(tampered(text, flip), public_key, now=now)
+        c.check(f"{label} compact flipped {where} byte -> invalid", status == qr_sign_core.INVALID,
+                f"-> {status}: {reason}")
+    status, _, _ = qr_sign_core.verify_qr_text(text[:-3], public_key, now=now)
+    c.check(f"{label} compact truncated -> not valid", status != qr_sign_core.VALID, f"-> {status}")
+
+    text, signed = qr_sign_core.sign_to_qr_text(payload, private_key, qr_sign_core.FORMAT_JSON)
+    status, _, _ = qr_sign_core.verify_qr_text(text.replace("DOC-0001", "DOC-0002"), public_key, now=now)
+    c.check(f"{label} json edited doc_id -> invalid", status == qr_sign_core.INVALID, f"-> {status}")
+    sig = bytearray(base64.b64decode(signed["signature"]))
+    sig[-1] ^= 0x01
+    forged = text.replace(signed["signature"], base64.b64encode(bytes(sig)).decode())
+    status, _, _ = qr_sign_core.verify_qr_text(forged, public_key, now=now)
+    c.check(f"{label} json flipped signature byte -> invalid", status == qr_sign_core.INVALID, f"-> {status}")
+
+def check_golden(c):
+    key = ed25519.Ed25519PrivateKey.from_private_bytes(GOLDEN_SEED)
+    payload = qr_sign_core.build_payload("golden", "DOC-GOLD", "", True, "WIB", now=GOLDEN_NOW)
+    text, _ = qr_sign_core.sign_to_qr_text(payload, key, qr_sign_core.FORMAT_COMPACT)
+    c.check("golden compact text unchanged", text == GOLDEN_TEXT, f"-> {text}")
+    status, reason, _ = qr_sign_core.verify_qr_text(GOLDEN_TEXT, key.public_key())
+    c.check("golden compact text verifies", status == qr_sign_core.VALID, f"-> {status}: {reason}")
+
+def check_keys(c):
+    p384 = ec.generate_private_key(ec.SECP384R1())
+    c.raises("P-384 key rejected", lambda: qr_sign_core.sign_to_qr_text(
+        qr_sign_core.build_payload("x"), p384, qr_sign_core.FORMAT_COMPACT))
+
+def check_revocation(c):
+    # doc_id angka (payload dari JSONL lama) harus dicek sebagai teks, bukan crash
+    key = ed25519.Ed25519PrivateKey.generate()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "revoked.sqlite3")
+        writer = qr_sign_core.RevocationList(path, create=True)
+        writer.revoke(["123"])
+        writer.close()
+        revocations = qr_sign_core.RevocationList(path)
+        for doc_id, expected in ((123, qr_sign_core.REVOKED), (124, qr_sign_core.VALID),
+                                 ("123", qr_sign_core.REVOKED)):
+            for fmt in (qr_sign_core.FORMAT_JSON, qr_sign_core.FORMAT_COMPACT):
+                payload = {"data": "Sertifikat C", "doc_id": doc_id}
+                text, _ = qr_sign_core.sign_to_qr_text(payload, key, fmt)
+                status, reason, _ = qr_sign_core.verify_qr_text(text, key.public_key(), revocations=revocations)
+                c.check(f"revocation doc_id {doc_id!r} {fmt} -> {expected}", status == expected,
+                        f"-> {status}: {reason}")
+        revocations.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-trip / tamper checks for the signed QR formats")
+    parser.add_argument("-v", "--verbose", action="store_true", help="also list passing checks")
+    args = parser.parse_args()
+
+    c = Checker(args.verbose)
+    check_base45(c)
+    check_cbor(c)
+    check_signed(c, "ES256", ec.generate_private_key(ec.SECP256R1()))
+    check_signed(c, "Ed25519", ed25519.Ed25519PrivateKey.generate())
+    check_golden(c)
+    check_keys(c)
+    check_revocation(c)
+    print(f"{c.passed} passed, {c.failed} failed")
+    return 1 if c.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import time
+_START = time.perf_counter()
+
+import argparse
+import os
+import sys
+import zipfile
+from multiprocessing import Pool
+
+import qr_core
+from batch_io import BulkOutput, iter_records
+
+_IMPORTED = time.perf_counter()
+
+# CLI QR Generator tanpa Tk (hanya qrcode + PIL)
+# ex: python qr_cli.py link https://example.com -o link.png
+#     python qr_cli.py kontak --name "Budi" --wa 62812345678 -o budi.png
+#     python qr_cli.py event --title "Rapat" --start "2024-03-12 09:00" -o rapat.png
+#     python qr_cli.py link https://example.com -o link.svg   (vektor: .svg / .pdf)
+#     python qr_cli.py bulk peserta.csv --zip peserta.zip -j 8 --format pdf
+#     python qr_cli.py bulk peserta.csv --out-dir qr/ --version 10 --mask 0   (encode dipin, lebih cepat)
+#     python qr_cli.py bulk peserta.csv --zip qr.zip --logo logo.png --auto-logo-ratio
+
+# ===================== ARGS =====================
+def add_render_args(parser):
+    parser.add_argument("-o", "--output", required=True, help="output file (.png / .jpg / .svg / .pdf)")
+    parser.add_argument("--size", type=int, default=500, help="resolusi QR (px)")
+    parser.add_argument("--logo", help="logo (opsional)")
+    parser.add_argument("--logo-ratio", type=float, default=0.2, help="ukuran logo (0-1)")
+    parser.add_argument("--timing", action="store_true", help="print startup/build/render time")
+    add_encode_args(parser)
+
+def add_encode_args(parser):
+    # Pin versi / mask: encode deterministik tanpa pencarian versi terkecil dan 8 mask
+    parser.add_argument("--version", type=int, choices=range(1, 41), metavar="1-40",
+                        help="fixed QR version (default: smallest that fits)")
+    parser.add_argument("--mask", type=int, choices=range(8), metavar="0-7",
+                        help="fixed mask pattern (default: best of 8)")
+    # Cek scan offline (OpenCV / zbar)
+    parser.add_argument("--check", action="store_true", help="decode the result back; fail if unreadable")
+    parser.add_argument("--auto-logo-ratio", action="store_true",
+                        help="use the largest logo ratio that still decodes (ignores --logo-ratio)")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="QR Generator (Link / Kontak / Event) without GUI")
+    sub = parser.add_subparsers(dest="qr_type", required=True)
+
+    p = sub.add_parser("link", help="URL / text")
+    p.add_argument("link")
+    add_render_args(p)
+
+    p = sub.add_parser("kontak", help="vCard")
+    p.add_argument("--name", required=True)
+    p.add_argument("--wa", default="", help="No WhatsApp (62xxxx)")
+    p.add_argument("--email", default="")
+    p.add_argument("--address", default="")
+    p.add_argument("--maps", default="", help="Link Google Maps")
+    add_render_args(p)
+
+    p = sub.add_parser("event", help="vCalendar")
+    p.add_argument("--title", required=True)
+    p.add_argument("--start", default="", help="YYYY-MM-DD HH:MM")
+    p.add_argument("--end", default="", help="YYYY-MM-DD HH:MM")
+    p.add_argument("--location", default="")
+    p.add_argument("--description", default="")
+    add_render_args(p)
+
+    p = sub.add_parser("bulk", help="many QR codes from a CSV / JSONL file")
+    p.add_argument("records", help="CSV (header row) or .jsonl; columns: type, link / name, wa, email, "
+                                   "address, maps / title, start, end, location, description, "
+                                   "optional filename, size, logo, logo_ratio")
+    out = p.add_mutually_exclusive_group(required=True)
+    out.add_argument("--zip", help="write codes into this ZIP file")
+    out.add_argument("--out-dir", help="write codes into this folder")
+    p.add_argument("--format", default="png", choices=["png", "svg", "pdf"], help="output format")
+    p.add_argument("--type", default="Link", help="QR type when the record has no 'type' column")
+    p.add_argument("--size", type=int, default=500)
+    p.add_argument("--logo")
+    p.add_argument("--logo-ratio", type=float, default=0.2)
+    p.add_argument("-j", "--workers", type=int, default=None, help="render processes (default: all cores)")
+    p.add_argument("--errors", help="write failed rows (row, error) to this CSV")
+    add_encode_args(p)
+    return parser
+
+# ===================== BULK =====================
+def normalize_type(value):
+    for name in qr_core.QR_TYPES:
+        if str(value).strip().lower() == name.lower():
+            return name
+    raise ValueError(f"Tipe QR tidak dikenal: {value}")
+
+def record_filename(row_no, record, qr_type, fmt="png"):
+    name = os.path.basename(str(record.get("filename") or "").strip())
+    if not name:
+        name = f"{row_no:06d}_{qr_type.lower()}"
+    ext = "." + fmt
+    return name if name.lower().endswith(ext) else name + ext
+
+def render_checked(data, fmt, logo, qr_size, logo_ratio, check, auto_logo_ratio, pin):
+    # -> bytes; ValueError bila hasil tidak bisa di-decode
+    fmt = fmt.lower().lstrip(".")
+    if logo and auto_logo_ratio:
+        # Pencarian di render kecil (6 px/modul), rasio terpilih dikonfirmasi sekali di bawah
+        logo_ratio = qr_core.find_max_logo_ratio(data, logo, **pin)
+        check = True
+    if fmt in qr_core.VECTOR_FORMATS:
+        # Vektor tidak bergantung resolusi: render 6 px/modul sudah mewakili
+        if check and not (logo and auto_logo_ratio) and not qr_core.scans(data, logo, logo_ratio, **pin):
+            raise ValueError("QR tidak terbaca (cek scan gagal)")
+        return qr_core.render_qr_bytes(data, fmt, logo, qr_size, logo_ratio, **pin)
+    # Raster: yang di-decode adalah gambar yang benar-benar ditulis
+    img = qr_core.make_qr_safe_logo(data, logo, qr_size=qr_size, logo_ratio=logo_ratio, **pin)
+    if check and qr_core.decode_qr(img) != data:
+        raise ValueError(f"QR tidak terbaca di {img.width}px (cek scan gagal)")
+    return qr_core.image_bytes(img, fmt)
+
+_defaults = {}
+
+def _init_worker(defaults):
+    _defaults.update(defaults)
+
+def _render_record(task):
+    # Jalan di worker: payload (aturan sama dengan GUI) -> render -> bytes (PNG / SVG / PDF)
+    row_no, record = task
+    try:
+        if isinstance(record, Exception):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError("Record harus berupa object")
+        qr_type = normalize_type(record.get("type") or _defaults["type"])
+        data = qr_core.build_qr_data(qr_type, record)
+        logo = record.get("logo") or _defaults["logo"]
+        logo_ratio = float(record.get("logo_ratio") or _defaults["logo_ratio"])
+        pin = {"version": _defaults["version"], "mask_pattern": _defaults["mask"]}
+        body = render_checked(data, _defaults["format"], logo, int(record.get("size") or _defaults["size"]),
+                              logo_ratio, _defaults["check"], _defaults["auto_logo_ratio"], pin)
+        return row_no, record_filename(row_no, record, qr_type, _defaults["format"]), body, None
+    except Exception as e:
+        return row_no, None, None, str(e)
+
+def run_bulk(args):
+    defaults = {"type": args.type, "size": args.size, "logo": args.logo, "logo_ratio": args.logo_ratio,
+                "format": args.format, "version": args.version, "mask": args.mask,
+                "check": args.check, "auto_logo_ratio": args.auto_logo_ratio}
+    # PNG / PDF sudah terkompresi -> ZIP_STORED; SVG (teks) dikompres. Ditulis begitu hasil selesai
+    compression = zipfile.ZIP_DEFLATED if args.format == "svg" else zipfile.ZIP_STORED
+    with BulkOutput(args.zip, args.out_dir, args.errors, compression) as out:
+        with Pool(args.workers, initializer=_init_worker, initargs=(defaults,)) as pool:
+            for row_no, name, body, error in pool.imap_unordered(_render_record, iter_records(args.records),
+                                                                chunksize=4):
+                if error:
+                    out.fail(row_no, error)
+                else:
+                    out.write(row_no, name, body)
+    return out.finish()
+
+# ===================== MAIN =====================
+QR_TYPE_NAMES = {"link": "Link", "kontak": "Kontak", "event": "Event"}
+RENDER_KEYS = {"qr_type", "output", "size", "logo", "logo_ratio", "timing", "version", "mask",
+               "check", "auto_logo_ratio"}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.qr_type == "bulk":
+        return run_bulk(args)
+    fields = {k: v for k, v in vars(args).items() if k not in RENDER_KEYS}
+
+    try:
+        t0 = time.perf_counter()
+        data = qr_core.build_qr_data(QR_TYPE_NAMES[args.qr_type], fields)
+        pin = {"version": args.version, "mask_pattern": args.mask}
+        t1 = time.perf_counter()
+        body = render_checked(data, os.path.splitext(args.output)[1] or "png", args.logo, args.size,
+                              args.logo_ratio, args.check, args.auto_logo_ratio, pin)
+        t2 = time.perf_counter()
+        with open(args.output, "wb") as f:
+            f.write(body)
+        t3 = time.perf_counter()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.timing:
+        print(f"import {(_IMPORTED - _START) * 1000:.1f} ms, build {(t1 - t0) * 1000:.1f} ms, "
+              f"render {(t2 - t1) * 1000:.1f} ms, save {(t3 - t2) * 1000:.1f} ms", file=sys.stderr)
+    print(args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+import base64
+import functools
+import io
+import os
+import zlib
+import qrcode
+import qrcode.exceptions
+from datetime import datetime
+from PIL import Image
+
+# Inti QR Generator tanpa Tk: dipakai GUI (QR-maker.py), CLI (qr_cli.py) dan script lain
+
+QR_TYPES = ("Link", "Kontak", "Event")
+MAX_QR_SIZE = 1500
+
+# ===================== PAYLOAD =====================
+def build_link(link):
+    data = (link or "").strip()
+    if not data:
+        raise ValueError("Link tidak boleh kosong")
+    return data
+
+def build_vcard(name, wa="", email="", address="", maps=""):
+    name = (name or "").strip()
+    wa = (wa or "").strip()
+    address = (address or "").strip()
+    if not name:
+        raise ValueError("Nama kontak wajib diisi")
+    if wa and not wa.startswith("62"):
+        raise ValueError("No WhatsApp harus diawali 62")
+    vcard = f"""BEGIN:VCARD
+VERSION:3.0
+N:{name}
+FN:{name}
+"""
+    if wa:
+        vcard += f"TEL:+{wa}\nURL:https://wa.me/{wa}\n"
+    if email:
+        vcard += f"EMAIL:{email}\n"
+    if address:
+        vcard += f"ADR:;;{address};;;;\n"
+    if maps:
+        vcard += f"URL:{maps}\n"
+    vcard += "END:VCARD"
+    return vcard
+
+def build_vevent(title, start=None, end=None, location="", description=""):
+    title = (title or "").strip()
+    if not title:
+        raise ValueError("Judul Event wajib diisi")
+    loc = (location or "").strip()
+    desc = (description or "").strip()
+
+    # Build vCalendar
+    event_text = "BEGIN:VCALENDAR\nVERSION:2.0\nBEGIN:VEVENT\n"
+    event_text += f"SUMMARY:{title}\n"
+    if start:
+        event_text += f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}\n"
+    if end:
+        event_text += f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}\n"
+    if loc:
+        event_text += f"LOCATION:{loc}\n"
+    if desc:
+        event_text += f"DESCRIPTION:{desc}\n"
+    event_text += "END:VEVENT\nEND:VCALENDAR"
+    return event_text
+
+def parse_event_datetime(value, error="Format tanggal salah"):
+    # '2024-03-12 09:00' / '2024-03-12T09:00' / datetime / kosong -> datetime atau None
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(error)
+
+def build_qr_data(qr_type, fields):
+    # fields: dict dengan key link / name, wa, email, address, maps / title, start, end, location, description
+    # Nilai non-teks (angka dari JSONL, ex: "wa": 6281234567) jadi str, sama dengan qr_server
+    get = lambda key: "" if fields.get(key) is None else str(fields[key])
+    if qr_type == "Link":
+        return build_link(get("link"))
+    elif qr_type == "Kontak":
+        return build_vcard(get("name"), get("wa"), get("email"), get("address"), get("maps"))
+    elif qr_type == "Event":
+        start = parse_event_datetime(fields.get("start"), "Format tanggal mulai salah")
+        end = parse_event_datetime(fields.get("end"), "Format tanggal selesai salah")
+        return build_vevent(get("title"), start, end, get("location"), get("description"))
+    raise ValueError(f"Tipe QR tidak dikenal: {qr_type}")
+
+# ===================== ENCODE =====================
+QR_BORDER = 4  # quiet zone (modul), sama dengan default qrcode
+
+ENCODE_CACHE_SIZE = 256  # matrix modul yang disimpan (LRU); payload sama -> hanya rasterisasi ulang
+
+def encode_qr(data, error_correction=qrcode.constants.ERROR_CORRECT_H, version=None, mask_pattern=None):
+    # -> matrix modul (tuple baris bool, immutable karena dipakai bersama) tanpa quiet zone.
+    # version / mask_pattern None = dicari qrcode (versi terkecil, mask terbaik dari 8);
+    # dipin = encode deterministik yang lebih cepat (bulk)
+    return _encode_cached(data, error_correction, version, mask_pattern)
+
+@functools.lru_cache(maxsize=ENCODE_CACHE_SIZE)
+def _encode_cached(data, error_correction, version, mask_pattern):
+    qr = qrcode.QRCode(version=version, error_correction=error_correction, border=0,
+                       mask_pattern=mask_pattern)
+    qr.add_data(data)
+    try:
+        qr.make(fit=version is None)
+    except qrcode.exceptions.DataOverflowError:
+        raise ValueError(f"Data terlalu panjang untuk QR versi {version}")
+    except ValueError:
+        # fit=True: qrcode mencoba versi 41 -> "Invalid version", bukan DataOverflowError
+        if version is not None:
+            raise
+        raise ValueError("Data terlalu panjang untuk QR (melebihi versi 40)")
+    return tuple(tuple(row) for row in qr.modules)
+
+encode_cache_info = _encode_cached.cache_info
+clear_encode_cache = _encode_cached.cache_clear
+
+def clamp_logo_ratio(logo_ratio):
+    return min(max(logo_ratio, 0.05), 0.25)  # logo max 25%
+
+# ===================== RASTER =====================
+def symbol_layout(n, qr_size, border=QR_BORDER):
+    # -> (offset, side) simbol n x n modul di kanvas qr_size px, di tengah.
+    # Modul bulat (box px, tepi tajam) selama sisa piksel tidak lebih dari menggandakan quiet
+    # zone; selain itu simbol di-scale NEAREST agar quiet zone tetap `border` modul.
+    total = n + 2 * border
+    box = qr_size // total
+    if box >= 1 and qr_size - total * box <= 2 * border * box:
+        side = n * box
+    else:
+        side = round(qr_size * n / total)
+    return (qr_size - side) // 2, side
+
+def render_modules(modules, qr_size, border=QR_BORDER):
+    # Render langsung di ukuran akhir: 1 px per modul lalu diperbesar NEAREST
+    n = len(modules)
+    offset, side = symbol_layout(n, qr_size, border)
+    small = Image.frombytes("L", (n, n), bytes(0 if dark else 255 for row in modules for dark in row))
+    qr_img = Image.new("L", (qr_size, qr_size), 255)
+    qr_img.paste(small.resize((side, side), Image.NEAREST), (offset, offset))
+    return qr_img
+
+# ===================== LOGO CACHE =====================
+LOGO_CACHE_SIZE = 32  # jumlah logo siap-tempel yang disimpan (LRU)
+
+@functools.lru_cache(maxsize=LOGO_CACHE_SIZE)
+def _prepared_logo(path, mtime_ns, file_size, size, fit, opacity):
+    # mtime_ns / file_size hanya bagian dari key: file diganti -> entry baru
+    logo = Image.open(path)
+    if logo.mode != "RGBA":
+        logo = logo.convert("RGBA")
+    if fit == "stretch":
+        logo = logo.resize((size, size), Image.LANCZOS)
+    else:
+        logo.thumbnail((size, size))
+    if opacity is not None:
+        logo.putalpha(opacity)  # alpha konstan, tanpa callback per piksel
+    return logo
+
+def load_logo(path, size, fit="thumbnail", opacity=None):
+    # Logo RGBA siap-tempel (decode + resample sekali per path/mtime/ukuran/opacity).
+    # Hasil dipakai bersama: hanya untuk dibaca / sumber paste, jangan diubah.
+    st = os.stat(path)
+    return _prepared_logo(os.path.abspath(path), st.st_mtime_ns, st.st_size, int(size), fit, opacity)
+
+logo_cache_info = _prepared_logo.cache_info
+clear_logo_cache = _prepared_logo.cache_clear
+
+# ===================== QR WITH SAFE LOGO =====================
+def make_qr_safe_logo(data, logo_path=None, qr_size=500, logo_ratio=0.2, version=None, mask_pattern=None):
+    qr_size = min(qr_size, MAX_QR_SIZE)
+    logo_ratio = clamp_logo_ratio(logo_ratio)
+    # Langsung di ukuran akhir, RGB hanya sekali di akhir
+    modules = encode_qr(data, version=version, mask_pattern=mask_pattern)
+    qr_img = render_modules(modules, qr_size).convert("RGB")
+
+    if logo_path:
+        # Logo relatif ke simbol + quiet zone standar (bukan kanvas) -> proporsi sama di
+        # preview kecil dan file besar, juga sama dengan SVG/PDF
+        n = len(modules)
+        span = symbol_layout(n, qr_size)[1] * (n + 2 * QR_BORDER) / n
+        # Buat space lebih besar dari logo untuk keamanan scan
+        safe_ratio = logo_ratio * 1.2
+        safe_size = int(span * safe_ratio)
+        x0 = (qr_size - safe_size) // 2
+        y0 = (qr_size - safe_size) // 2
+        x1 = x0 + safe_size
+        y1 = y0 + safe_size
+
+        # Satu operasi region (C), bukan putpixel per piksel
+        qr_img.paste((255, 255, 255), (x0, y0, x1, y1))
+
+        # Logo sudah di-resize agar pas di safe space (dari cache)
+        logo = load_logo(logo_path, int(span * logo_ratio))
+        x_logo = (qr_size - logo.size[0]) // 2
+        y_logo = (qr_size - logo.size[1]) // 2
+        qr_img.paste(logo, (x_logo, y_logo), mask=logo)
+
+    return qr_img
+
+# ===================== SCAN CHECK =====================
+_decoder = None
+
+def _get_decoder():
+    # Decoder lokal, di-import lazy (opsional): OpenCV, lalu zbar -> fungsi(PIL image) -> list teks
+    global _decoder
+    if _decoder is None:
+        try:
+            import cv2
+            import numpy as np
+            # Detector Aruco (OpenCV >= 4.7) menangkap QR yang gagal dideteksi detector standar
+            detectors = [cv2.QRCodeDetector()]
+            if hasattr(cv2, "QRCodeDetectorAruco"):
+                detectors.append(cv2.QRCodeDetectorAruco())
+            def decode(img):
+                arr = np.asarray(img.convert("L"))
+                for detector in detectors:
+                    text = detector.detectAndDecode(arr)[0]
+                    if text:
+                        return [text]
+                return []
+        except ImportError:
+            try:
+                from pyzbar import pyzbar
+            except ImportError:
+                raise RuntimeError("Cek scan butuh opencv-python atau pyzbar")
+            def decode(img):
+                return [r.data.decode("utf-8", "replace") for r in pyzbar.decode(img.convert("L"))]
+        _decoder = decode
+    return _decoder
+
+DECODE_MAX_SIDE = 1000  # gambar besar dicoba dulu versi kecilnya (jauh lebih cepat)
+
+def decode_qr(img):
+    # PIL image / path -> teks QR pertama atau None
+    if not isinstance(img, Image.Image):
+        with Image.open(img) as f:
+            img = f.convert("L")
+    decode = _get_decoder()
+    factor = -(-max(img.size) // DECODE_MAX_SIDE)
+    if factor > 1:
+        found = decode(img.convert("L").reduce(factor))
+        if found:
+            return found[0]
+    found = decode(img)
+    return found[0] if found else None
+
+def scans(data, logo_path=None, logo_ratio=0.2, version=None, mask_pattern=None, px_per_module=6):
+    # Render kecil (6 px/modul, tata letak logo proporsional sama) lalu decode balik.
+    # Cek murah untuk pencarian / vektor; raster final dicek dengan decode_qr pada gambarnya.
+    modules = encode_qr(data, version=version, mask_pattern=mask_pattern)
+    size = (len(modules) + 2 * QR_BORDER) * px_per_module
+    img = make_qr_safe_logo(data, logo_path, qr_size=size, logo_ratio=logo_ratio,
+                            version=version, mask_pattern=mask_pattern)
+    return decode_qr(img) == data
+
+MIN_LOGO_RATIO, MAX_LOGO_RATIO = 0.05, 0.25
+_ratio_cache = {}  # (panjang payload, versi, logo, mtime, mask) -> rasio terbesar yang terbaca
+
+def find_max_logo_ratio(data, logo_path, version=None, mask_pattern=None, tolerance=0.01):
+    # Binary search rasio logo terbesar yang masih bisa di-decode. Hasil di-cache per panjang
+    # payload + versi + logo; nilai cache dicek sekali dengan payload ini sebelum dipakai.
+    modules = encode_qr(data, version=version, mask_pattern=mask_pattern)
+    qr_version = (len(modules) - 17) // 4
+    key = (len(data.encode("utf-8")), qr_version, os.path.abspath(logo_path),
+           os.stat(logo_path).st_mtime_ns, mask_pattern)
+    check = lambda ratio: scans(data, logo_path, ratio, version, mask_pattern)
+    cached = _ratio_cache.get(key)
+    if cached is not None and check(cached):
+        return cached
+
+    lo, hi = MIN_LOGO_RATIO, MAX_LOGO_RATIO
+    if check(hi):
+        lo = hi
+    elif not check(lo):
+        raise ValueError("QR tidak terbaca bahkan dengan logo terkecil")
+    while hi - lo > tolerance:
+        mid = (lo + hi) / 2
+        if check(mid):
+            lo = mid
+        else:
+            hi = mid
+    ratio = round(lo, 3)
+    _ratio_cache[key] = ratio if cached is None else min(ratio, cached)
+    return ratio
+
+# ===================== VECTOR (SVG / PDF) =====================
+LOGO_MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".svg": "image/svg+xml"}
+
+def module_runs(modules):
+    # Modul gelap per baris digabung jadi run horizontal -> (x, y, panjang)
+    for y, row in enumerate(modules):
+        x = 0
+        n = len(row)
+        while x < n:
+            if row[x]:
+                start = x
+                while x < n and row[x]:
+                    x += 1
+                yield start, y, x - start
+            else:
+                x += 1
+
+def _logo_layout(total, logo_ratio):
+    # (safe zone, kotak logo) dalam satuan modul, sama dengan versi raster
+    safe = total * logo_ratio * 1.2
+    size = total * logo_ratio
+    return (total - safe) / 2, safe, (total - size) / 2, size
+
+def _fit_logo_box(logo_path, mime, logo_xy, size):
+    # Rasio logo dijaga (seperti thumbnail); Image.open hanya membaca header
+    if mime == "image/svg+xml":
+        return logo_xy, logo_xy, size, size
+    with Image.open(logo_path) as logo:
+        width, height = logo.size
+    fit = min(size / width, size / height)
+    w, h = width * fit, height * fit
+    return logo_xy + (size - w) / 2, logo_xy + (size - h) / 2, w, h
+
+def make_qr_svg(data, logo_path=None, qr_size=500, logo_ratio=0.2, border=QR_BORDER,
+                version=None, mask_pattern=None):
+    modules = encode_qr(data, version=version, mask_pattern=mask_pattern)
+    total = len(modules) + 2 * border
+    path = "".join(f"M{x + border},{y + border}h{w}v1h-{w}z" for x, y, w in module_runs(modules))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{qr_size}" height="{qr_size}" '
+        f'viewBox="0 0 {total} {total}" shape-rendering="crispEdges">',
+        f'<rect width="{total}" height="{total}" fill="#fff"/>',
+        f'<path d="{path}" fill="#000"/>',
+    ]
+    if logo_path:
+        safe_xy, safe, logo_xy, size = _logo_layout(total, clamp_logo_ratio(logo_ratio))
+        mime = LOGO_MIME.get(os.path.splitext(logo_path)[1].lower(), "image/png")
+        with open(logo_path, "rb") as f:
+            # File logo di-embed apa adanya, sekali, tanpa decode/resample
+            encoded = base64.b64encode(f.read()).decode("ascii")
+        x, y, w, h = _fit_logo_box(logo_path, mime, logo_xy, size)
+        parts.append(f'<rect x="{safe_xy:.3f}" y="{safe_xy:.3f}" width="{safe:.3f}" height="{safe:.3f}" fill="#fff"/>')
+        parts.append(f'<image x="{x:.3f}" y="{y:.3f}" width="{w:.3f}" height="{h:.3f}" '
+                     f'preserveAspectRatio="xMidYMid meet" href="data:{mime};base64,{encoded}"/>')
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+def _pdf_logo_objects(logo_path):
+    # -> objek image XObject (+ SMask); JPEG di-embed langsung (DCTDecode)
+    logo = Image.open(logo_path)
+    width, height = logo.size
+    if logo.format == "JPEG" and logo.mode in ("RGB", "L"):
+        with open(logo_path, "rb") as f:
+            raw = f.read()
+        colorspace = "/DeviceRGB" if logo.mode == "RGB" else "/DeviceGray"
+        return [(f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                 f"/ColorSpace {colorspace} /BitsPerComponent 8 /Filter /DCTDecode", raw)]
+    logo = logo.convert("RGBA")
+    rgb = zlib.compress(logo.convert("RGB").tobytes())
+    alpha = zlib.compress(logo.getchannel("A").tobytes())
+    image = (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceRGB "
+             f"/BitsPerComponent 8 /Filter /FlateDecode /SMask {{smask}}", rgb)
+    smask = (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceGray "
+             f"/BitsPerComponent 8 /Filter /FlateDecode", alpha)
+    return [image, smask]
+
+def make_qr_pdf(data, logo_path=None, qr_size=500, logo_ratio=0.2, border=QR_BORDER,
+                version=None, mask_pattern=None):
+    # PDF satu halaman (qr_size x qr_size pt), modul digambar sebagai persegi panjang vektor
+    modules = encode_qr(data, version=version, mask_pattern=mask_pattern)
+    total = len(modules) + 2 * border
+    scale = qr_size / total
+    ops = [f"q {scale:.6f} 0 0 {-scale:.6f} 0 {qr_size} cm", "0 g"]  # sumbu y ke bawah, satuan modul
+    ops += [f"{x + border} {y + border} {w} 1 re" for x, y, w in module_runs(modules)]
+    ops.append("f")
+
+    streams = []  # (dictionary tanpa '>>', bytes) untuk objek stream tambahan
+    if logo_path:
+        safe_xy, safe, logo_xy, size = _logo_layout(total, clamp_logo_ratio(logo_ratio))
+        x, y, w, h = _fit_logo_box(logo_path, None, logo_xy, size)
+        ops.append(f"1 g {safe_xy:.4f} {safe_xy:.4f} {safe:.4f} {safe:.4f} re f")
+        ops.append(f"q {w:.4f} 0 0 {-h:.4f} {x:.4f} {y + h:.4f} cm /Logo Do Q")
+        streams = _pdf_logo_objects(logo_path)
+    ops.append("Q")
+    content = zlib.compress("\n".join(ops).encode("ascii"))
+
+    # 1 Catalog, 2 Pages, 3 Page, 4 Contents, 5.. logo (+ SMask)
+    resources = "/XObject << /Logo 5 0 R >>" if streams else ""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {qr_size} {qr_size}] "
+        f"/Resources << {resources} >> /Contents 4 0 R >>".encode("ascii"),
+        b"<< /Filter /FlateDecode /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+    ]
+    for i, (head, raw) in enumerate(streams):
+        head = head.format(smask=f"{6 + i} 0 R")
+        objects.append(f"{head} /Length {len(raw)} >>\nstream\n".encode("ascii") + raw + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+# ===================== OUTPUT =====================
+VECTOR_FORMATS = ("svg", "pdf")
+
+def render_qr_bytes(data, fmt="png", logo_path=None, qr_size=500, logo_ratio=0.2, version=None, mask_pattern=None):
+    fmt = fmt.lower().lstrip(".")
+    pin = {"version": version, "mask_pattern": mask_pattern}
+    if fmt == "svg":
+        return make_qr_svg(data, logo_path, qr_size, logo_ratio, **pin).encode("utf-8")
+    if fmt == "pdf":
+        return make_qr_pdf(data, logo_path, qr_size, logo_ratio, **pin)
+    return image_bytes(make_qr_safe_logo(data, logo_path, qr_size=qr_size, logo_ratio=logo_ratio, **pin), fmt)
+
+def image_bytes(img, fmt="png"):
+    fmt = fmt.lower().lstrip(".")
+    buf = io.BytesIO()
+    img.save(buf, "JPEG" if fmt in ("jpg", "jpeg") else fmt.upper())
+    return buf.getvalue()
+
+def save_qr(path, data, logo_path=None, qr_size=500, logo_ratio=0.2, version=None, mask_pattern=None):
+    # Format dari ekstensi file: .png / .jpg (raster) atau .svg / .pdf (vektor)
+    fmt = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+    with open(path, "wb") as f:
+        f.write(render_qr_bytes(data, fmt, logo_path, qr_size, logo_ratio, version, mask_pattern))
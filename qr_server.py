@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import qr_core
+
+# Service HTTP lokal untuk render QR (Link / Kontak / Event) dengan aturan yang sama seperti QR-maker.py
+# ex: python qr_server.py --port 8765 --logo-dir logos/
+#     curl "http://127.0.0.1:8765/qr?type=Link&link=https://example.com&size=400" -o link.png
+#     curl -X POST http://127.0.0.1:8765/qr -d '{"type":"Kontak","name":"Budi","format":"svg"}'
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 64
+MAX_BODY = 64 * 1024
+CONTENT_TYPES = {"png": "image/png", "jpg": "image/jpeg", "svg": "image/svg+xml", "pdf": "application/pdf"}
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# ===================== CACHE =====================
+class ResponseCache:
+    # LRU dibatasi total byte; key = hash parameter request (juga dipakai sebagai ETag)
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        body = self.items.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        old = self.items.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.items[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.items.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self):
+        return {"entries": len(self.items), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+# ===================== RENDER =====================
+FIELDS = ("link", "name", "wa", "email", "address", "maps", "title", "start", "end", "location", "description")
+
+def normalize_params(raw, logo_dir):
+    # Query / JSON -> parameter render yang tervalidasi (ValueError -> 400)
+    qr_type = str(raw.get("type") or "Link").strip().lower()
+    names = {t.lower(): t for t in qr_core.QR_TYPES}
+    if qr_type not in names:
+        raise ValueError(f"Tipe QR tidak dikenal: {raw.get('type')}")
+    fmt = str(raw.get("format") or "png").lower()
+    if fmt not in CONTENT_TYPES:
+        raise ValueError(f"Format tidak didukung: {fmt}")
+    params = {
+        "type": names[qr_type],
+        "fields": {k: str(raw[k]) for k in FIELDS if raw.get(k)},
+        "format": fmt,
+        "size": min(int(raw.get("size") or 500), qr_core.MAX_QR_SIZE),
+        "logo_ratio": qr_core.clamp_logo_ratio(float(raw.get("logo_ratio") or 0.2)),
+        "logo": None,
+        "logo_mtime": None,
+    }
+    if params["size"] < 21:
+        raise ValueError("size terlalu kecil")
+    logo = raw.get("logo")
+    if logo:
+        # Logo hanya dari --logo-dir (nama file, bukan path bebas)
+        if not logo_dir:
+            raise ValueError("Server dijalankan tanpa --logo-dir")
+        path = os.path.join(logo_dir, os.path.basename(str(logo)))
+        if not os.path.isfile(path):
+            raise ValueError(f"Logo tidak ditemukan: {logo}")
+        params["logo"] = path
+        params["logo_mtime"] = os.stat(path).st_mtime_ns  # logo diganti -> key baru
+    return params
+
+def cache_key(params):
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+def render(params):
+    # Jalan di worker process
+    data = qr_core.build_qr_data(params["type"], params["fields"])
+    return qr_core.render_qr_bytes(data, params["format"], params["logo"],
+                                   qr_size=params["size"], logo_ratio=params["logo_ratio"])
+
+# ===================== HTTP =====================
+class HTTPError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(message)
+        self.status = status
+
+class QRServer:
+    def __init__(self, pool, cache, logo_dir=None):
+        self.pool = pool
+        self.cache = cache
+        self.logo_dir = logo_dir
+        self.pending = {}  # key -> Future render yang sedang jalan (request identik ikut menunggu)
+        self.requests = 0
+        self.renders = 0
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 minimal dengan keep-alive
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Panjang body tidak diketahui -> stream tidak bisa dilanjutkan
+                    await self.send(writer, 400, b"invalid content-length", keep_alive=False)
+                    break
+                if length > MAX_BODY:
+                    await self.send(writer, 413, b"payload too large", keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+                status, extra, payload = await self.respond(method.upper(), target, headers, body)
+                await self.send(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, headers, body):
+        self.requests += 1
+        url = urlsplit(target)
+        try:
+            if url.path == "/health":
+                stats = {"requests": self.requests, "renders": self.renders, "cache": self.cache.stats()}
+                return 200, {"Content-Type": "application/json"}, json.dumps(stats).encode()
+            if url.path != "/qr":
+                raise HTTPError(404, "not found")
+            if method == "GET":
+                raw = dict(parse_qsl(url.query))
+            elif method == "POST":
+                raw = self.parse_body(headers, body)
+            else:
+                raise HTTPError(405, "method not allowed")
+            try:
+                params = normalize_params(raw, self.logo_dir)
+            except (TypeError, ValueError) as e:
+                raise HTTPError(400, str(e))
+
+            key = cache_key(params)
+            etag = f'"{key}"'
+            extra = {"ETag": etag, "Cache-Control": "public, max-age=86400",
+                     "Content-Type": CONTENT_TYPES[params["format"]]}
+            if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+                return 304, extra, b""
+            payload = self.cache.get(key)
+            extra["X-Cache"] = "HIT" if payload is not None else "MISS"
+            if payload is None:
+                payload = await self.render_once(key, params)
+            return 200, extra, payload
+        except HTTPError as e:
+            return e.status, {"Content-Type": "text/plain; charset=utf-8"}, str(e).encode("utf-8")
+        except Exception as e:
+            return 500, {"Content-Type": "text/plain; charset=utf-8"}, str(e).encode("utf-8")
+
+    @staticmethod
+    def parse_body(headers, body):
+        if "json" in headers.get("content-type", "") or body.lstrip().startswith(b"{"):
+            try:
+                raw = json.loads(body or b"{}")
+            except ValueError as e:
+                raise HTTPError(400, f"JSON tidak valid: {e}")
+            if not isinstance(raw, dict):
+                raise HTTPError(400, "JSON harus berupa object")
+            return raw
+        return dict(parse_qsl(body.decode("utf-8")))
+
+    async def render_once(self, key, params):
+        future = self.pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.pool, render, params)
+            self.pending[key] = future
+            try:
+                payload = await future
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+            finally:
+                self.pending.pop(key, None)
+            self.renders += 1
+            self.cache.put(key, payload)
+            return payload
+        try:
+            return await asyncio.shield(future)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    @staticmethod
+    async def send(writer, status, payload, extra=None, keep_alive=True):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(payload) if status != 304 else 0}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if status != 304:
+            writer.write(payload)
+        await writer.drain()
+
+# ===================== MAIN =====================
+async def serve(args):
+    cache = ResponseCache(int(args.cache_size * 1024 * 1024))
+    with ProcessPoolExecutor(args.workers) as pool:
+        app = QRServer(pool, cache, args.logo_dir)
+        server = await asyncio.start_server(app.handle, args.host, args.port)
+        print(f"QR server on http://{args.host}:{args.port}/qr", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP QR rendering service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="render processes (default: all cores)")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_CACHE_MB, help="response cache size in MB")
+    parser.add_argument("--logo-dir", help="folder with logos usable via ?logo=<filename>")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import qr_sign_core
+from batch_io import BulkOutput, iter_input_files, iter_records, make_row_writer
+
+# CLI QR Signature tanpa Tk: tanda tangan massal dari CSV / JSONL
+# ex: python qr_sign_cli.py sign sertifikat.csv --key private.pem --out-dir qr/ --timestamp --tz WIB
+#     python qr_sign_cli.py sign sertifikat.jsonl --key private.pem --zip qr.zip --expires-at "2026-12-31 23:59"
+#     python qr_sign_cli.py sign sertifikat.csv --key private.pem --zip qr.zip --mask 0 -j 8   (lebih cepat)
+#     python qr_sign_cli.py sign sertifikat.csv --key private.pem --out-dir qr/ --format compact
+#     python qr_sign_cli.py verify scans/ --pubkey public.pem -o report.csv   (JSON / compact otomatis)
+#     python qr_sign_cli.py verify scans/ --pubkey keys/        (folder PEM: key dipilih lewat kid)
+#     python qr_sign_cli.py revoke --db revoked.sqlite3 DOC-001 DOC-002 --reason "salah cetak"
+#     python qr_sign_cli.py verify scans/ --pubkey public.pem --revocations revoked.sqlite3
+# Kolom: data (wajib), doc_id, created_by, expires_at, filename (opsional)
+
+LOGO_MODES = {"none": qr_sign_core.LOGO_NONE, "embedded": qr_sign_core.LOGO_EMBEDDED,
+              "whitespace": qr_sign_core.LOGO_WHITE_SPACE}
+
+# ===================== ARGS =====================
+def build_parser():
+    parser = argparse.ArgumentParser(description="Signed QR codes without GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("sign", help="sign many documents from a CSV / JSONL file")
+    p.add_argument("records", help="CSV (header row) or .jsonl; columns: data, doc_id, created_by, "
+                                   "optional expires_at, filename")
+    p.add_argument("--key", required=True, help="private key (PEM)")
+    out = p.add_mutually_exclusive_group(required=True)
+    out.add_argument("--zip", help="write PNGs + manifest into this ZIP file")
+    out.add_argument("--out-dir", help="write PNGs + manifest into this folder")
+    p.add_argument("--manifest", help="manifest JSONL path (default: manifest.jsonl next to the PNGs)")
+    p.add_argument("--timestamp", action="store_true", help="add timestamp (always added to rows with an expiry)")
+    p.add_argument("--tz", default="UTC", choices=list(qr_sign_core.TIMEZONES))
+    p.add_argument("--expires-at", help="default expiry 'YYYY-MM-DD HH:MM' (in --tz) for rows without one; implies --timestamp")
+    p.add_argument("--color", default="#000000", help="QR colour")
+    p.add_argument("--bg", default="#FFFFFF", help="background colour")
+    p.add_argument("--logo")
+    p.add_argument("--logo-mode", default="embedded", choices=list(LOGO_MODES))
+    p.add_argument("--logo-opacity", type=int, default=255)
+    p.add_argument("--mask", type=int, choices=range(8), metavar="0-7",
+                   help="fixed QR mask pattern: faster encode (default: best of 8)")
+    p.add_argument("--format", default=qr_sign_core.FORMAT_JSON,
+                   choices=[qr_sign_core.FORMAT_JSON, qr_sign_core.FORMAT_COMPACT],
+                   help="QR content: signed JSON or compact CBOR + Base45 (smaller QR)")
+    p.add_argument("-j", "--workers", type=int, default=None, help="sign/render processes (default: all cores)")
+    p.add_argument("--errors", help="write failed rows (row, error) to this CSV")
+
+    p = sub.add_parser("verify", help="decode and verify a folder / glob of QR images")
+    p.add_argument("target", help="folder (recursive) or glob pattern of QR images")
+    p.add_argument("--pubkey", required=True,
+                   help="public key (PEM) or a folder of issuer public keys selected by the payload's kid")
+    p.add_argument("-o", "--output", help="report file (.csv or .jsonl; default: CSV on stdout)")
+    p.add_argument("--revocations",
+                   help="existing revocation list (SQLite, see 'revoke') checked after the signature")
+    p.add_argument("-j", "--workers", type=int, default=None, help="decode/verify processes (default: all cores)")
+
+    p = sub.add_parser("revoke", help="add / remove doc_ids in a revocation list")
+    p.add_argument("doc_ids", nargs="*")
+    p.add_argument("--db", required=True, help="revocation list (SQLite, created if missing)")
+    p.add_argument("--file", help="text file with one doc_id per line")
+    p.add_argument("--reason", default="")
+    p.add_argument("--remove", action="store_true", help="un-revoke the given doc_ids")
+    return parser
+
+# ===================== SIGN =====================
+def record_filename(row_no, record):
+    name = os.path.basename(str(record.get("filename") or record.get("doc_id") or "").strip())
+    if not name:
+        name = f"{row_no:06d}"
+    return name if name.lower().endswith(".png") else name + ".png"
+
+_opts = {}
+
+def _init_signer(opts):
+    _opts.update(opts)
+    _opts["private_key"] = qr_sign_core.get_private_key(opts["key"])  # sekali per proses
+
+def _sign_record(task):
+    # Jalan di worker: payload (aturan sama dengan GUI) -> tanda tangan -> PNG bytes
+    row_no, record = task
+    try:
+        if isinstance(record, Exception):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError("Record harus berupa object")
+        # expires_at tanpa timestamp akan dibuang build_payload -> di batch, expiry memaksa timestamp
+        expires_at = record.get("expires_at") or _opts["expires_at"]
+        # Angka dari JSONL jadi teks -> payload sama dengan yang dibuat GUI (Entry selalu str)
+        text_of = lambda key: "" if record.get(key) is None else str(record[key])
+        payload = qr_sign_core.build_payload(
+            text_of("data"), text_of("doc_id"), text_of("created_by"),
+            _opts["timestamp"] or bool(expires_at), _opts["tz"], expires_at)
+        text, payload = qr_sign_core.sign_to_qr_text(payload, _opts["private_key"], _opts["format"])
+        img = qr_sign_core.make_signed_qr(
+            text, _opts["color"], _opts["bg"],
+            _opts["logo_mode"], _opts["logo"], _opts["logo_opacity"], _opts["mask"])
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        return row_no, record_filename(row_no, record), buf.getvalue(), payload, None
+    except Exception as e:
+        return row_no, None, None, None, str(e)
+
+def run_sign(args):
+    opts = {"key": args.key, "timestamp": args.timestamp, "tz": args.tz, "expires_at": args.expires_at,
+            "color": args.color, "bg": args.bg, "logo": args.logo or "",
+            "logo_mode": LOGO_MODES[args.logo_mode], "logo_opacity": args.logo_opacity,
+            "mask": args.mask, "format": args.format}
+    try:
+        # gagal cepat sebelum worker dibuat (file / tipe key / curve)
+        qr_sign_core.key_algorithm(qr_sign_core.get_private_key(args.key))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    manifest_path = args.manifest or (None if args.zip else os.path.join(args.out_dir, "manifest.jsonl"))
+    with BulkOutput(args.zip, args.out_dir, args.errors, done_label="signed", rate_label="items/sec") as out:
+        manifest = open(manifest_path, "w", encoding="utf-8") if manifest_path else io.StringIO()
+        try:
+            with Pool(args.workers, initializer=_init_signer, initargs=(opts,)) as pool:
+                for row_no, name, png, payload, error in pool.imap_unordered(
+                        _sign_record, iter_records(args.records), chunksize=8):
+                    if error:
+                        out.fail(row_no, error)
+                        continue
+                    name = out.write(row_no, name, png)
+                    # Manifest: satu baris JSON per QR (file + payload bertanda tangan)
+                    manifest.write(json.dumps({"row": row_no, "file": name, "format": args.format,
+                                               "payload": payload},
+                                              ensure_ascii=False, separators=(",", ":")) + "\n")
+        finally:
+            if not manifest_path:
+                out.add_file("manifest.jsonl", manifest.getvalue())
+            manifest.close()
+    return out.finish()
+
+# ===================== VERIFY =====================
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+REPORT_FIELDS = ["file", "status", "reason", "doc_id", "expires_at"]
+
+def _init_verifier(pubkey, revocations):
+    _opts["public_key"] = qr_sign_core.load_verification_keys(pubkey)  # index sekali per proses
+    # Bloom filter dibangun sekali per proses, lalu hanya baris baru yang dibaca
+    _opts["revocations"] = qr_sign_core.RevocationList(revocations) if revocations else None
+
+def _verify_file(path):
+    status, reason, payload = qr_sign_core.verify_image(path, _opts["public_key"],
+                                                        revocations=_opts["revocations"])
+    payload = payload or {}
+    return {"file": path, "status": status, "reason": reason,
+            "doc_id": payload.get("doc_id", ""), "expires_at": payload.get("expires_at", "")}
+
+def run_verify(args):
+    try:
+        keys = qr_sign_core.load_verification_keys(args.pubkey)  # gagal cepat sebelum worker dibuat
+        if isinstance(keys, qr_sign_core.KeyRegistry):
+            print(f"{len(keys)} public keys in {args.pubkey}", file=sys.stderr)
+        if args.revocations:
+            qr_sign_core.RevocationList(args.revocations).close()  # harus sudah ada (read-only)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    fmt = "jsonl" if args.output and args.output.lower().endswith((".jsonl", ".ndjson")) else "csv"
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    write_row = make_row_writer(out, fmt, REPORT_FIELDS)
+
+    statuses = Counter()
+    reasons = Counter()
+    start = time.perf_counter()
+    try:
+        with Pool(args.workers, initializer=_init_verifier, initargs=(args.pubkey, args.revocations)) as pool:
+            # Report ditulis per file begitu selesai (streaming)
+            for row in pool.imap_unordered(_verify_file, iter_input_files(args.target, IMAGE_EXTS),
+                                           chunksize=8):
+                write_row(row)
+                statuses[row["status"]] += 1
+                if row["status"] != qr_sign_core.VALID:
+                    reasons[f"{row['status']}: {row['reason']}"] += 1
+                done = sum(statuses.values())
+                if done % 500 == 0:
+                    rate = done / (time.perf_counter() - start)
+                    print(f"{done} files, {rate:.1f} files/sec", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    total = sum(statuses.values())
+    rate = total / elapsed if elapsed else 0.0
+    summary = ", ".join(f"{name} {statuses[name]}" for name in
+                        (qr_sign_core.VALID, qr_sign_core.INVALID, qr_sign_core.EXPIRED,
+                         qr_sign_core.REVOKED, qr_sign_core.UNDECODABLE, qr_sign_core.ERROR))
+    print(f"Done: {total} files in {elapsed:.1f}s, {rate:.1f} files/sec ({summary})", file=sys.stderr)
+    for reason, count in reasons.most_common(10):
+        print(f"  {count:>6}  {reason}", file=sys.stderr)
+    return 0 if statuses[qr_sign_core.VALID] == total else 2
+
+# ===================== REVOKE =====================
+def run_revoke(args):
+    doc_ids = [d.strip() for d in args.doc_ids if d.strip()]
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            doc_ids += [line.strip() for line in f if line.strip()]
+    if not doc_ids:
+        print("Error: no doc_ids given", file=sys.stderr)
+        return 1
+    revocations = qr_sign_core.RevocationList(args.db, create=True)
+    try:
+        if args.remove:
+            removed = revocations.unrevoke(doc_ids)
+            print(f"Removed {removed} doc_ids", file=sys.stderr)
+        else:
+            revocations.revoke(doc_ids, args.reason)
+            print(f"Revoked {len(doc_ids)} doc_ids", file=sys.stderr)
+        print(f"{revocations.stats()['entries']} doc_ids revoked in {args.db}", file=sys.stderr)
+    finally:
+        revocations.close()
+    return 0
+
+# ===================== MAIN =====================
+COMMANDS = {"sign": run_sign, "verify": run_verify, "revoke": run_revoke}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,645 @@
+import base64
+import glob
+import hashlib
+import json
+import math
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from PIL import ImageOps
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+
+import qr_core
+
+# Inti QR Signature tanpa Tk: dipakai QR_Sign.py (GUI) dan script batch
+
+# ===================== KEY STORE =====================
+class KeyStore:
+    # Key PEM di-parse sekali per (path, mtime, ukuran file); file berubah -> dibaca ulang
+    def __init__(self):
+        self._keys = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def _get(self, kind, path, load):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._keys.get((kind, path))
+            if entry and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+        with open(path, "rb") as f:
+            key = load(f.read())
+        with self._lock:
+            self._keys[(kind, path)] = (stamp, key)
+            self.loads += 1
+        return key
+
+    def private_key(self, path, password=None):
+        return self._get("private", path, lambda pem: serialization.load_pem_private_key(pem, password=password))
+
+    def public_key(self, path):
+        return self._get("public", path, serialization.load_pem_public_key)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+key_store = KeyStore()
+
+def get_private_key(path, password=None):
+    return key_store.private_key(path, password)
+
+def get_public_key(path):
+    return key_store.public_key(path)
+
+# ===================== KEY ID / REGISTRY =====================
+# kid = SHA-256 dari DER SubjectPublicKeyInfo, dipotong 8 byte (16 hex)
+KID_BYTES = 8
+_PUBLIC_PEM = re.compile(rb"-----BEGIN PUBLIC KEY-----(.*?)-----END PUBLIC KEY-----", re.S)
+_key_ids = {}  # id(key) -> (key, kid); key ikut disimpan supaya id tidak dipakai ulang
+
+def kid_from_der(spki_der):
+    return hashlib.sha256(spki_der).digest()[:KID_BYTES].hex()
+
+def kid_from_pem(pem):
+    # Dari body base64 PEM langsung, tanpa parse key
+    match = _PUBLIC_PEM.search(pem)
+    if not match:
+        raise ValueError("Bukan PEM public key")
+    return kid_from_der(base64.b64decode(b"".join(match.group(1).split())))
+
+def key_id(key):
+    entry = _key_ids.get(id(key))
+    if entry is None or entry[0] is not key:
+        public = key.public_key() if isinstance(key, (ec.EllipticCurvePrivateKey,
+                                                      ed25519.Ed25519PrivateKey)) else key
+        der = public.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+        if len(_key_ids) >= 64:
+            _key_ids.clear()
+        entry = _key_ids[id(key)] = (key, kid_from_der(der))
+    return entry[1]
+
+class KeyRegistry:
+    # Folder PEM public key: di-index per kid saat dibuat, key di-parse saat pertama dipakai
+    def __init__(self, directory):
+        self.directory = directory
+        self.paths = {}
+        self.keys = {}
+        self._lock = threading.Lock()
+        for path in sorted(glob.glob(os.path.join(directory, "*.pem"))):
+            with open(path, "rb") as f:
+                pem = f.read()
+            try:
+                self.paths[kid_from_pem(pem)] = path
+            except ValueError:
+                continue  # private key / sertifikat / file lain
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get(self, kid):
+        if kid is None:
+            if len(self.paths) != 1:
+                raise LookupError("payload tanpa kid")
+            kid = next(iter(self.paths))
+        key = self.keys.get(kid)
+        if key is None:
+            path = self.paths.get(kid)
+            if path is None:
+                raise LookupError(f"kid tidak dikenal: {kid}")
+            with self._lock:
+                key = self.keys.get(kid)
+                if key is None:
+                    with open(path, "rb") as f:
+                        key = self.keys[kid] = serialization.load_pem_public_key(f.read())
+        return key
+
+_registries = {}
+
+def get_registry(directory):
+    # Satu registry per folder; di-index ulang bila isi folder berubah (mtime folder)
+    directory = os.path.abspath(directory)
+    stamp = os.stat(directory).st_mtime_ns
+    entry = _registries.get(directory)
+    if entry is None or entry[0] != stamp:
+        entry = _registries[directory] = (stamp, KeyRegistry(directory))
+    return entry[1]
+
+def load_verification_keys(path):
+    # File PEM -> satu public key; folder -> KeyRegistry (banyak penerbit, dipilih lewat kid)
+    if os.path.isdir(path):
+        return get_registry(path)
+    return get_public_key(path)
+
+def resolve_key(keys, payload):
+    # keys: satu public key atau KeyRegistry -> public key untuk payload ini (LookupError bila tidak ada)
+    kid = payload.get("kid")
+    if isinstance(keys, KeyRegistry):
+        return keys.get(kid)
+    if kid and kid != key_id(keys):
+        raise LookupError("kid tidak cocok dengan public key")
+    return keys
+
+# ===================== ALGORITHM =====================
+# Dipilih dari tipe key; dicatat di payload sebagai "alg" (tidak ada = ES256, payload lama)
+ALG_ES256, ALG_ED25519 = "ES256", "Ed25519"
+DEFAULT_ALG = ALG_ES256
+
+def key_algorithm(key):
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return ALG_ED25519
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        # ES256 = P-256 + SHA-256; curve lain tidak muat di signature mentah 64 byte (compact)
+        if not isinstance(key.curve, ec.SECP256R1):
+            raise ValueError(f"Curve EC tidak didukung: {key.curve.name} (hanya P-256 / secp256r1)")
+        return ALG_ES256
+    raise ValueError(f"Tipe key tidak didukung: {type(key).__name__}")
+
+def sign_bytes(private_key, data):
+    # -> signature (ES256: DER, Ed25519: 64 byte)
+    if key_algorithm(private_key) == ALG_ED25519:
+        return private_key.sign(data)
+    return private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+
+def verify_bytes(public_key, alg, sig, data):
+    # InvalidSignature bila tidak cocok; ValueError bila alg tidak sesuai key
+    if alg != key_algorithm(public_key):
+        raise ValueError(f"Algoritma {alg} tidak cocok dengan public key")
+    if alg == ALG_ED25519:
+        public_key.verify(sig, data)
+    else:
+        public_key.verify(sig, data, ec.ECDSA(hashes.SHA256()))
+
+# ===================== PAYLOAD =====================
+TIMEZONES = {"UTC": 0, "WIB": 7, "WITA": 8, "WIT": 9}
+
+def get_timezone(name):
+    if name not in TIMEZONES:
+        raise ValueError(f"Timezone tidak dikenal: {name}")
+    return timezone(timedelta(hours=TIMEZONES[name]))
+
+def build_payload(data, doc_id="", created_by="", add_timestamp=False, tz="UTC", expires_at=None, now=None):
+    # Urutan key sama dengan GUI; expires_at hanya ikut bila timestamp ditambahkan
+    data = (data or "").strip()
+    if not data:
+        raise ValueError("required")
+    payload = {"data": data}
+    if doc_id: payload["doc_id"] = doc_id
+    if created_by: payload["created_by"] = created_by
+
+    tzinfo = get_timezone(tz)
+    if add_timestamp:
+        now = now or datetime.now(tzinfo)
+        payload["timestamp"] = now.isoformat()
+        if expires_at:
+            if not isinstance(expires_at, datetime):
+                expires_at = datetime.fromisoformat(str(expires_at).strip())
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=tzinfo)
+            payload["expires_at"] = expires_at.isoformat()
+    return payload
+
+def canonical_bytes(payload):
+    # Bytes yang ditandatangani / diverifikasi
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+def with_key_info(payload, key):
+    # "alg" dan "kid" ikut ditandatangani; alg ES256 tidak ditulis (default payload lama)
+    signed = dict(payload)
+    alg = key_algorithm(key)
+    if alg != DEFAULT_ALG:
+        signed["alg"] = alg
+    signed["kid"] = key_id(key)
+    return signed
+
+def sign_payload(payload, private_key):
+    # -> payload baru dengan "alg" (non-ES256), "kid" dan "signature" (base64)
+    signed = with_key_info(payload, private_key)
+    signed["signature"] = base64.b64encode(sign_bytes(private_key, canonical_bytes(signed))).decode()
+    return signed
+
+def qr_text(payload):
+    # Isi QR (format sama dengan GUI)
+    return json.dumps(payload, ensure_ascii=False)
+
+# ===================== COMPACT FORMAT =====================
+# Isi QR: "QS:" + Base45(versi (1 byte) + CBOR map (key integer) + signature mentah r||s (64 byte)).
+# Semua karakter masuk alphanumeric mode QR -> versi QR jauh lebih kecil daripada JSON + DER base64.
+FORMAT_JSON, FORMAT_COMPACT = "json", "compact"
+COMPACT_PREFIX = "QS:"
+COMPACT_VERSION = 1
+SIG_SIZE = 64
+COMPACT_KEYS = {"data": 0, "doc_id": 1, "created_by": 2, "timestamp": 3, "expires_at": 4, "alg": 6, "kid": 7}
+TZ_KEY = 5  # offset timezone (menit) untuk timestamp / expires_at
+
+BASE45 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+_BASE45_INDEX = {c: i for i, c in enumerate(BASE45)}
+
+def b45encode(raw):
+    out = []
+    for i in range(0, len(raw) - 1, 2):
+        n = raw[i] * 256 + raw[i + 1]
+        n, c = divmod(n, 45)
+        e, d = divmod(n, 45)
+        out += (BASE45[c], BASE45[d], BASE45[e])
+    if len(raw) % 2:
+        d, c = divmod(raw[-1], 45)
+        out += (BASE45[c], BASE45[d])
+    return "".join(out)
+
+def b45decode(text):
+    try:
+        values = [_BASE45_INDEX[c] for c in text]
+    except KeyError:
+        raise ValueError("Karakter Base45 tidak valid")
+    tail = len(values) % 3
+    if tail == 1:
+        raise ValueError("Panjang Base45 tidak valid")
+    out = bytearray()
+    end = len(values) - tail
+    for i in range(0, end, 3):
+        n = values[i] + values[i + 1] * 45 + values[i + 2] * 2025
+        if n > 0xFFFF:
+            raise ValueError("Base45 tidak valid")
+        out.append(n >> 8)
+        out.append(n & 0xFF)
+    if tail:
+        n = values[end] + values[end + 1] * 45
+        if n > 0xFF:
+            raise ValueError("Base45 tidak valid")
+        out.append(n)
+    return bytes(out)
+
+# CBOR minimal (RFC 8949): int, bytes, text, map -- cukup untuk payload di atas
+def _cbor_head(major, n):
+    if n < 24:
+        return bytes([major << 5 | n])
+    for info, size in ((24, 1), (25, 2), (26, 4), (27, 8)):
+        if n < 1 << (8 * size):
+            return bytes([major << 5 | info]) + n.to_bytes(size, "big")
+    raise ValueError("Integer terlalu besar")
+
+def cbor_dumps(value):
+    if isinstance(value, bool):
+        raise TypeError("bool tidak didukung")
+    if isinstance(value, int):
+        return _cbor_head(0, value) if value >= 0 else _cbor_head(1, -1 - value)
+    if isinstance(value, bytes):
+        return _cbor_head(2, len(value)) + value
+    if isinstance(value, str):
+        raw = value.encode("utf-8")
+        return _cbor_head(3, len(raw)) + raw
+    if isinstance(value, dict):
+        # Key diurutkan -> encoding deterministik
+        return _cbor_head(5, len(value)) + b"".join(cbor_dumps(k) + cbor_dumps(value[k]) for k in sorted(value))
+    raise TypeError(f"Tipe tidak didukung: {type(value).__name__}")
+
+def _cbor_read(raw, pos):
+    if pos >= len(raw):
+        raise ValueError("CBOR terpotong")
+    major, info = raw[pos] >> 5, raw[pos] & 31
+    pos += 1
+    if info < 24:
+        n = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        if pos + size > len(raw):
+            raise ValueError("CBOR terpotong")
+        n = int.from_bytes(raw[pos:pos + size], "big")
+        pos += size
+    else:
+        raise ValueError("CBOR tidak didukung")
+    if major == 0:
+        return n, pos
+    if major == 1:
+        return -1 - n, pos
+    if major in (2, 3):
+        if pos + n > len(raw):
+            raise ValueError("CBOR terpotong")
+        chunk = raw[pos:pos + n]
+        return (bytes(chunk) if major == 2 else chunk.decode("utf-8")), pos + n
+    if major == 5:
+        value = {}
+        for _ in range(n):
+            key, pos = _cbor_read(raw, pos)
+            value[key], pos = _cbor_read(raw, pos)
+        return value, pos
+    raise ValueError("CBOR tidak didukung")
+
+def cbor_loads(raw):
+    value, pos = _cbor_read(raw, 0)
+    if pos != len(raw):
+        raise ValueError("Sisa byte setelah CBOR")
+    return value
+
+def _to_compact_map(payload):
+    # Payload JSON (dict) -> map key integer; waktu jadi epoch detik + satu offset timezone
+    fields = {}
+    for name, key in COMPACT_KEYS.items():
+        if name not in payload:
+            continue
+        value = payload[name]
+        if name in ("timestamp", "expires_at"):
+            moment = datetime.fromisoformat(value)
+            fields[TZ_KEY] = int(moment.utcoffset().total_seconds() // 60)
+            value = int(moment.timestamp())
+        elif name == "kid":
+            value = bytes.fromhex(value)
+        fields[key] = value
+    return fields
+
+def _from_compact_map(fields):
+    if not isinstance(fields, dict) or not isinstance(fields.get(0), str):
+        raise ValueError("Payload compact tidak valid")
+    tzinfo = timezone(timedelta(minutes=fields.get(TZ_KEY, 0)))
+    payload = {}
+    for name, key in COMPACT_KEYS.items():
+        if key in fields:
+            value = fields[key]
+            if name in ("timestamp", "expires_at"):
+                value = datetime.fromtimestamp(value, tzinfo).isoformat()
+            elif name == "kid":
+                value = value.hex()
+            payload[name] = value
+    return payload
+
+def raw_signature(sig, alg=DEFAULT_ALG):
+    # ES256 DER -> r||s (64 byte); Ed25519 sudah 64 byte
+    if alg == ALG_ED25519:
+        return sig
+    r, s = decode_dss_signature(sig)
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+def native_signature(raw, alg=DEFAULT_ALG):
+    if alg == ALG_ED25519:
+        return raw
+    return encode_dss_signature(int.from_bytes(raw[:32], "big"), int.from_bytes(raw[32:], "big"))
+
+def compact_qr_text(payload, private_key):
+    # -> (isi QR, payload yang benar-benar ditandatangani; timestamp dibulatkan ke detik)
+    payload = with_key_info(payload, private_key)
+    body = bytes([COMPACT_VERSION]) + cbor_dumps(_to_compact_map(payload))
+    sig = raw_signature(sign_bytes(private_key, body), key_algorithm(private_key))
+    return COMPACT_PREFIX + b45encode(body + sig), _from_compact_map(cbor_loads(body[1:]))
+
+def parse_compact(text):
+    # -> (bytes yang ditandatangani, signature mentah, payload dict)
+    raw = b45decode(text[len(COMPACT_PREFIX):])
+    if len(raw) < 1 + SIG_SIZE or raw[0] != COMPACT_VERSION:
+        raise ValueError("Versi payload compact tidak didukung")
+    body, sig = raw[:-SIG_SIZE], raw[-SIG_SIZE:]
+    return body, sig, _from_compact_map(cbor_loads(body[1:]))
+
+def sign_to_qr_text(payload, private_key, fmt=FORMAT_JSON):
+    # -> (isi QR, payload untuk manifest)
+    if fmt == FORMAT_COMPACT:
+        return compact_qr_text(payload, private_key)
+    signed = sign_payload(payload, private_key)
+    return qr_text(signed), signed
+
+# ===================== REVOCATION =====================
+REVOCATION_SCHEMA = '''
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS revoked (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL UNIQUE,
+    reason TEXT NOT NULL DEFAULT '',
+    revoked_at REAL NOT NULL
+);
+'''
+
+class BloomFilter:
+    # Bit array + k posisi dari satu hash BLAKE2b (double hashing)
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class RevocationList:
+    # Daftar doc_id yang dicabut: SQLite (UNIQUE index) sebagai sumber, Bloom filter di memori
+    # sebagai saringan cepat -> hampir semua doc_id yang tidak dicabut tidak menyentuh SQLite.
+    # refresh() hanya membaca baris baru (seq > terakhir), tidak memuat ulang semuanya.
+    # Verifier membuka read-only (create=False): path salah -> error, bukan daftar kosong
+    # yang membuat dokumen dicabut tetap VALID. Hanya `revoke` yang membuat file baru.
+    def __init__(self, path, refresh_seconds=5.0, create=False):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.lock = threading.Lock()
+        if create:
+            self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.db.executescript(REVOCATION_SCHEMA)
+        else:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Revocation list tidak ditemukan: {path}")
+            uri = pathlib.Path(path).absolute().as_uri() + "?mode=ro"
+            self.db = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+            self.db.execute("SELECT 1 FROM revoked LIMIT 1")  # bukan revocation list -> error sekarang
+        # Bloom filter dibangun saat is_revoked pertama; writer (`revoke`) tidak pernah memuatnya
+        self.bloom = None
+        self.last_seq = 0
+        self.last_refresh = 0.0
+        self.lookups = 0
+        self.db_hits = 0
+
+    def _rebuild(self, total):
+        # Kapasitas 2x supaya tambahan inkremental tidak menaikkan false positive
+        self.bloom = BloomFilter(max(total * 2, 1024))
+        self.last_seq = 0
+
+    def refresh(self, force=False):
+        with self.lock:
+            now = time.monotonic()
+            if not force and self.bloom is not None and now - self.last_refresh < self.refresh_seconds:
+                return 0
+            self.last_refresh = now
+            if self.bloom is None:
+                self._rebuild(self.db.execute("SELECT COUNT(*) FROM revoked").fetchone()[0])
+            new = self.db.execute("SELECT COUNT(*) FROM revoked WHERE seq > ?", (self.last_seq,)).fetchone()[0]
+            if not new:
+                return 0
+            if self.bloom.count + new > self.bloom.capacity:
+                self._rebuild(self.bloom.count + new)
+            # Cursor dibaca per baris (tanpa fetchall) -> memori tidak tumbuh dengan jumlah baris
+            added = 0
+            for seq, doc_id in self.db.execute("SELECT seq, doc_id FROM revoked WHERE seq > ? ORDER BY seq",
+                                               (self.last_seq,)):
+                self.bloom.add(doc_id)
+                self.last_seq = seq
+                added += 1
+            return added
+
+    def is_revoked(self, doc_id):
+        # Kolom doc_id TEXT; payload lama bisa berisi angka (JSONL) -> dibandingkan sebagai teks
+        doc_id = "" if doc_id is None else str(doc_id)
+        if not doc_id:
+            return False
+        self.refresh()
+        self.lookups += 1
+        if doc_id not in self.bloom:
+            return False
+        # Bloom bilang "mungkin": pastikan di SQLite. doc_id yang di-unrevoke tetap punya bit di
+        # filter (tidak di-rebuild), jadi hanya menambah satu query, tidak pernah salah REVOKED.
+        with self.lock:
+            self.db_hits += 1
+            return self.db.execute("SELECT 1 FROM revoked WHERE doc_id = ?", (doc_id,)).fetchone() is not None
+
+    def revoke(self, doc_ids, reason=""):
+        # INSERT OR REPLACE -> seq baru, jadi ikut terbaca oleh refresh() (inkremental) proses lain.
+        # Filter tidak dimuat di sini; bila sudah ada, lookup berikutnya membaca baris baru dulu.
+        with self.lock, self.db:
+            written = self.db.executemany(
+                "INSERT OR REPLACE INTO revoked (doc_id, reason, revoked_at) VALUES (?, ?, ?)",
+                ((str(doc_id), reason, time.time()) for doc_id in doc_ids)).rowcount
+            self.last_refresh = 0.0
+        return written
+
+    def unrevoke(self, doc_ids):
+        with self.lock, self.db:
+            return self.db.executemany("DELETE FROM revoked WHERE doc_id = ?",
+                                       ((str(doc_id),) for doc_id in doc_ids)).rowcount
+
+    def stats(self):
+        with self.lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM revoked").fetchone()[0]
+        return {"entries": entries, "lookups": self.lookups, "db_hits": self.db_hits,
+                "bloom_bits": self.bloom.size if self.bloom else 0,
+                "bloom_hashes": self.bloom.hashes if self.bloom else 0}
+
+    def close(self):
+        self.db.close()
+
+# ===================== VERIFY =====================
+VALID, INVALID, EXPIRED, REVOKED, UNDECODABLE, ERROR = (
+    "valid", "invalid", "expired", "revoked", "undecodable", "error")
+
+def verify_payload(payload, keys, now=None, revocations=None):
+    # Sama dengan verify_qr: signature dulu, lalu daftar cabut dan expires_at -> (status, alasan)
+    payload = dict(payload)
+    try:
+        sig = base64.b64decode(payload.pop("signature"))
+    except KeyError:
+        return INVALID, "tanpa signature"
+    except ValueError:
+        return INVALID, "signature bukan base64"
+    return _check_signature(payload, canonical_bytes(payload), sig, keys, now, revocations)
+
+def _check_signature(payload, signed_bytes, sig, keys, now=None, revocations=None):
+    # Key dari "kid" (lookup dict), algoritma dari "alg" di payload
+    try:
+        public_key = resolve_key(keys, payload)
+    except LookupError as e:
+        return INVALID, str(e)
+    try:
+        verify_bytes(public_key, payload.get("alg", DEFAULT_ALG), sig, signed_bytes)
+    except InvalidSignature:
+        return INVALID, "signature tidak cocok"
+    except ValueError as e:
+        return INVALID, str(e)
+    # Dicek setelah signature: doc_id hanya bisa dipercaya dari payload yang sah
+    if revocations is not None and revocations.is_revoked(payload.get("doc_id")):
+        return REVOKED, "doc_id dicabut"
+    return check_expiry(payload, now)
+
+def check_expiry(payload, now=None):
+    if "expires_at" in payload:
+        exp = datetime.fromisoformat(payload["expires_at"])
+        if (now or datetime.now(exp.tzinfo)) > exp:
+            return EXPIRED, "lewat expires_at"
+    return VALID, ""
+
+def verify_qr_text(text, keys, now=None, revocations=None):
+    # Isi QR (JSON atau compact "QS:...", dideteksi otomatis) -> (status, alasan, payload atau None)
+    # keys: satu public key atau KeyRegistry
+    text = text.strip("\r\n\t")  # spasi termasuk alfabet Base45
+    if text.startswith(COMPACT_PREFIX):
+        try:
+            body, sig, payload = parse_compact(text)
+        except Exception as e:
+            return ERROR, f"Payload compact tidak valid: {e}", None
+        try:
+            sig = native_signature(sig, payload.get("alg", DEFAULT_ALG))
+            return (*_check_signature(payload, body, sig, keys, now, revocations), payload)
+        except Exception as e:
+            return ERROR, str(e), payload
+    try:
+        payload = json.loads(text)
+    except ValueError as e:
+        return ERROR, f"JSON tidak valid: {e}", None
+    if not isinstance(payload, dict):
+        return ERROR, "payload bukan object", None
+    try:
+        return (*verify_payload(payload, keys, now, revocations), payload)
+    except Exception as e:
+        return ERROR, str(e), payload
+
+def verify_image(path, keys, now=None, revocations=None):
+    # Gambar QR -> decode offline -> verify; -> (status, alasan, payload atau None)
+    try:
+        text = qr_core.decode_qr(path)
+    except Exception as e:
+        return ERROR, str(e), None
+    if text is None:
+        return UNDECODABLE, "QR tidak terdeteksi", None
+    return verify_qr_text(text, keys, now, revocations)
+
+# ===================== QR IMAGE =====================
+LOGO_NONE, LOGO_EMBEDDED, LOGO_WHITE_SPACE = 1, 2, 3
+BOX_SIZE = 12
+
+def add_logo_safe(qr_img, logo_mode=LOGO_NONE, logo_path="", logo_opacity=255):
+    # Tetap RGB, hanya area tengah yang disentuh (qr_img RGB diubah in place)
+    if qr_img.mode != "RGB":
+        qr_img = qr_img.convert("RGB")
+    w, h = qr_img.size
+
+    if logo_mode == LOGO_NONE or not logo_path:
+        return qr_img
+
+    # Logo siap-tempel dari cache (decode + LANCZOS + opacity sekali per file/ukuran)
+    size = int(w * 0.20)
+    logo = qr_core.load_logo(logo_path, size, fit="stretch", opacity=logo_opacity)
+
+    if logo_mode == LOGO_WHITE_SPACE:
+        safe = int(size * 1.1)
+        # Satu fill region (tepi kanan/bawah inklusif seperti ImageDraw.rectangle)
+        qr_img.paste((255, 255, 255), ((w-safe)//2, (h-safe)//2, (w+safe)//2 + 1, (h+safe)//2 + 1))
+
+    qr_img.paste(logo, ((w-size)//2,(h-size)//2), logo)
+    return qr_img
+
+def make_signed_qr(text, fill_color="#000000", back_color="#FFFFFF", logo_mode=LOGO_NONE,
+                   logo_path="", logo_opacity=255, mask_pattern=None):
+    # ERROR_CORRECT_H, box 12 px, border 4 modul (sama dengan GUI); mask dipin = encode lebih cepat
+    modules = qr_core.encode_qr(text, mask_pattern=mask_pattern)
+    size = (len(modules) + 2 * qr_core.QR_BORDER) * BOX_SIZE
+    qr_img = ImageOps.colorize(qr_core.render_modules(modules, size), fill_color, back_color)
+    return add_logo_safe(qr_img, logo_mode, logo_path, logo_opacity)